@@ -1,14 +1,21 @@
 """Improved archive processing with streaming support for large files."""
 
 import io
+import itertools
 import logging
 import os
+import queue
 import shutil
+import subprocess
 import tempfile
-from collections.abc import Iterator
+import threading
+import zipfile
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from pathlib import Path
-from typing import BinaryIO, NamedTuple
+from typing import Any, BinaryIO, NamedTuple
 
 try:
     import py7zr
@@ -29,9 +36,8 @@ class ArchiveHandler(NamedTuple):
     """Archive handler configuration."""
 
     available: bool
-    get_contents_method: str
-    extract_method: str
-    stream_method: str
+    get_contents: Callable[[Path], list[str]]
+    extract: Callable[[Path, list[str] | None], list["ExtractedFile"]]
 
 
 class ExtractedFile:
@@ -54,19 +60,140 @@ class StreamedFile:
         self.size = size
 
 
+def _basename(name: str) -> str:
+    """Get the final component of an archive member name."""
+    return name[name.rfind("/") + 1 :]
+
+
+def _target_paths(names: list[str], temp_dir: Path) -> list[Path]:
+    """Get collision-free extraction paths for archive members.
+
+    Members keep their file name; later members whose name was already used
+    (compared case-insensitively) go into numbered subdirectories. Those
+    directories never take a name any member extracts to, so a member named
+    like one can't collide with it.
+
+    Args:
+        names: Archive member names, in extraction order.
+        temp_dir: Directory the members are extracted into.
+
+    Returns:
+        Path to extract each member to, in the order of names.
+    """
+    reserved = {_basename(name).casefold() for name in names}
+    duplicate_dirs: list[Path] = []  # Directory holding each level of repeated names
+    next_dir = itertools.count(1)
+    seen: dict[str, int] = {}
+    targets = []
+
+    for name in names:
+        basename = _basename(name)
+        key = basename.casefold()
+        duplicates = seen.get(key, 0)
+        seen[key] = duplicates + 1
+        if not duplicates:
+            targets.append(temp_dir / basename)
+            continue
+
+        while len(duplicate_dirs) < duplicates:
+            dir_name = f"dup{next(next_dir)}"
+            if dir_name.casefold() not in reserved:
+                subdir = temp_dir / dir_name
+                subdir.mkdir()
+                duplicate_dirs.append(subdir)
+        targets.append(duplicate_dirs[duplicates - 1] / basename)
+
+    return targets
+
+
+def _suffix_lower(name: str) -> str:
+    """Get the lowercased extension of an archive member name, like Path.suffix."""
+    dot = name.rfind(".")
+    if dot <= name.rfind("/") + 1 or dot == len(name) - 1:
+        return ""
+    return name[dot:].lower()
+
+
+class _PipeWriter:
+    """Write end of a pipe exposed to py7zr as an extraction target."""
+
+    def __init__(self, fd: int) -> None:
+        """Initialize the writer around a pipe file descriptor."""
+        self._pipe = os.fdopen(fd, "wb")
+        self._size = 0
+
+    def write(self, data: bytes | bytearray) -> int:
+        """Write decompressed data into the pipe."""
+        self._pipe.write(data)
+        self._size += len(data)
+        return len(data)
+
+    def read(self, size: int | None = None) -> bytes:
+        """Pipes are write-only from this side."""
+        return b""
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        """Pipes cannot seek; report the current position."""
+        return self._size
+
+    def seekable(self) -> bool:
+        """Tell py7zr not to rewind the pipe after extraction."""
+        return False
+
+    def flush(self) -> None:
+        """Flush buffered data into the pipe."""
+        self._pipe.flush()
+
+    def size(self) -> int:
+        """Get the number of bytes written so far."""
+        return self._size
+
+    def close(self) -> None:
+        """Leave the pipe open; it is closed once the extraction call returns."""
+
+    def close_pipe(self) -> None:
+        """Close the pipe, signalling end of stream to the reader."""
+        try:
+            self._pipe.close()
+        except OSError:
+            pass  # Reader already went away
+
+
+class _PipeWriterFactory:
+    """py7zr writer factory that routes a single member into a pipe."""
+
+    def __init__(self, writer: _PipeWriter) -> None:
+        """Initialize the factory with the pipe writer to hand out."""
+        self._writer = writer
+
+    def create(self, filename: str) -> _PipeWriter:
+        """Return the pipe writer for the extracted member."""
+        return self._writer
+
+
 class ArchiveProcessor:
     """Handles extraction and processing of archive files with streaming support."""
 
     # Default configuration
     DEFAULT_CHUNK_SIZE = 64 * 1024  # 64KB chunks
+    READ_BUFFER_SIZE = 32 * 1024  # 32KB buffer feeding the decompressor
+    WRITE_BUFFER_SIZE = 1024 * 1024  # 1MB buffer batching writes to extracted files
+    SEVEN_ZIP_BLOCK_SIZE = 1024 * 1024  # 1MB input blocks fed to the py7zr decompressor
     DEFAULT_MAX_MEMORY_SIZE = 100 * 1024 * 1024  # 100MB threshold for streaming
     DEFAULT_EXTRACTION_TIMEOUT = 30  # seconds
+    DEFAULT_MAX_WORKERS = min(8, os.cpu_count() or 1)  # Parallel entry extraction
+    PIPELINE_MIN_SIZE = 4 * 1024 * 1024  # Overlap decompression and writes above 4MB
+    PIPELINE_QUEUE_DEPTH = 4  # Chunks buffered between the reader and writer threads
+    CONTENTS_CACHE_SIZE = 128  # Archives whose listings are kept between calls
+    ZIP_TAIL_READ_SIZE = 64 * 1024  # Tail read that usually holds a ZIP's central directory
 
     def __init__(
         self,
         max_memory_size: int | None = None,
         chunk_size: int | None = None,
         extraction_timeout: int | None = None,
+        max_workers: int | None = None,
+        use_native_tools: bool = True,
     ) -> None:
         """Initialize the archive processor.
 
@@ -74,25 +201,45 @@ class ArchiveProcessor:
             max_memory_size: Maximum size (bytes) to load in memory before streaming.
             chunk_size: Size of chunks for streaming operations.
             extraction_timeout: Timeout for extraction operations.
+            max_workers: Maximum worker threads used to extract ZIP entries in parallel.
+            use_native_tools: Extract 7z/RAR archives with the system 7z/unrar binaries
+                when they are installed.
         """
         self.logger = logging.getLogger(__name__)
-        self._temp_dirs: list[Path] = []
+        # All extractions share one session temp root, created on first use
+        self._session_root: Path | None = None
+        self._temp_counter = itertools.count()
+        self._temp_lock = threading.Lock()
         self.max_memory_size = max_memory_size or self.DEFAULT_MAX_MEMORY_SIZE
         self.chunk_size = chunk_size or self.DEFAULT_CHUNK_SIZE
         self.extraction_timeout = extraction_timeout or self.DEFAULT_EXTRACTION_TIMEOUT
+        self.max_workers = max_workers or self.DEFAULT_MAX_WORKERS
 
+        # Bound methods are stored directly so dispatch needs no getattr lookup
         self._handlers = {
-            ".zip": ArchiveHandler(
-                True, "_get_zip_contents", "_extract_zip_files", "_stream_zip_file"
-            ),
-            ".7z": ArchiveHandler(
-                HAS_PY7ZR, "_get_7z_contents", "_extract_7z_files", "_stream_7z_file"
-            ),
-            ".rar": ArchiveHandler(
-                HAS_RARFILE, "_get_rar_contents", "_extract_rar_files", "_stream_rar_file"
-            ),
+            ".zip": ArchiveHandler(True, self._get_zip_contents, self._extract_zip_files),
+            ".7z": ArchiveHandler(HAS_PY7ZR, self._get_7z_contents, self._extract_7z_files),
+            ".rar": ArchiveHandler(HAS_RARFILE, self._get_rar_contents, self._extract_rar_files),
         }
 
+        # Native extractors run decompression outside the interpreter
+        self._native_tools: dict[str, str] = {}
+        if use_native_tools:
+            seven_zip = shutil.which("7z") or shutil.which("7zz") or shutil.which("7za")
+            if seven_zip:
+                self._native_tools[".7z"] = seven_zip
+            unrar = shutil.which("unrar")
+            if unrar:
+                self._native_tools[".rar"] = unrar
+
+        # Archive listings keyed by (path, mtime_ns, size) so the scan's
+        # get_archive_contents -> extract_files sequence parses each archive once
+        self._contents_cache: OrderedDict[tuple[str, int, int], list[str]] = OrderedDict()
+        self._zip_info_cache: OrderedDict[tuple[str, int, int], list[zipfile.ZipInfo]] = (
+            OrderedDict()
+        )
+        self._cache_lock = threading.Lock()
+
         # Track resource usage
         self._active_streams = 0
         self._total_memory_used = 0
@@ -105,8 +252,10 @@ class ArchiveProcessor:
         if handler is None or not handler.available:
             return False
 
-        # Check if file exists and is readable
-        if not archive_path.exists():
+        # Check if file exists and is readable; one stat also gives the size below
+        try:
+            file_size = archive_path.stat().st_size
+        except FileNotFoundError:
             self.logger.warning(f"Archive does not exist: {archive_path}")
             return False
 
@@ -115,7 +264,6 @@ class ArchiveProcessor:
             return False
 
         # Check for potential zip bomb
-        file_size = archive_path.stat().st_size
         if file_size > 5 * 1024 * 1024 * 1024:  # 5GB
             self.logger.warning(f"Archive is very large ({file_size} bytes), may be a zip bomb")
 
@@ -131,8 +279,13 @@ class ArchiveProcessor:
             return []
 
         try:
-            method = getattr(self, handler.get_contents_method)
-            return method(archive_path)
+            key = self._get_cache_key(archive_path)
+            contents = self._cache_get(self._contents_cache, key)
+            if contents is None:
+                contents = handler.get_contents(archive_path)
+                if contents:
+                    self._cache_put(self._contents_cache, key, contents)
+            return contents
         except FileNotFoundError as e:
             self.logger.error(f"Archive file not found: {e}")
             return []
@@ -169,7 +322,12 @@ class ArchiveProcessor:
         # Check archive size to determine extraction method
         archive_size = archive_path.stat().st_size
 
-        if use_streaming and archive_size > self.max_memory_size:
+        # Native tools already extract straight to disk, so they handle large archives too
+        if (
+            use_streaming
+            and archive_size > self.max_memory_size
+            and extension not in self._native_tools
+        ):
             self.logger.info(
                 f"Archive size ({archive_size} bytes) exceeds memory threshold, "
                 f"using streaming extraction"
@@ -177,8 +335,7 @@ class ArchiveProcessor:
             return self._extract_files_streaming(archive_path, file_filter)
 
         try:
-            method = getattr(self, handler.extract_method)
-            return method(archive_path, file_filter)
+            return handler.extract(archive_path, file_filter)
         except MemoryError as e:
             self.logger.error(f"Out of memory extracting archive: {e}")
             # Try streaming extraction as fallback
@@ -210,26 +367,26 @@ class ArchiveProcessor:
         if handler is None:
             return []
 
-        temp_dir = Path(tempfile.mkdtemp(prefix="romshelf_stream_"))
-        self._temp_dirs.append(temp_dir)
+        temp_dir = self._create_temp_dir()
         extracted_files = []
+        extensions = frozenset(ext.lower() for ext in file_filter) if file_filter else None
 
         try:
             with self._open_archive_for_streaming(archive_path, extension) as archive:
-                for file_info in self._iterate_archive_files(archive, extension):
-                    # Check file filter
-                    if file_filter:
-                        file_ext = Path(file_info["name"]).suffix.lower()
-                        if file_ext not in file_filter:
-                            continue
-
+                members = self._iterate_archive_files(archive, extension)
+                # Filter once up front so the loop body has no per-entry filter branch
+                if extensions is not None:
+                    members = (m for m in members if _suffix_lower(m["name"]) in extensions)
+                members = list(members)
+                targets = _target_paths([m["name"] for m in members], temp_dir)
+
+                for file_info, extracted_path in zip(members, targets, strict=True):
                     # Stream file to disk
-                    extracted_path = temp_dir / Path(file_info["name"]).name
 
+                    # Buffer output so many chunks are flushed per write syscall
                     with self._stream_archive_file(archive, file_info, extension) as stream:
-                        with open(extracted_path, "wb") as output:
-                            while chunk := stream.read(self.chunk_size):
-                                output.write(chunk)
+                        with open(extracted_path, "wb", buffering=self.WRITE_BUFFER_SIZE) as output:
+                            self._copy_stream(stream, output, file_info["size"])
 
                     extracted_files.append(
                         ExtractedFile(file_info["name"], extracted_path, temp_dir)
@@ -252,14 +409,18 @@ class ArchiveProcessor:
             Archive object for streaming.
         """
         if extension == ".zip":
-            import zipfile
-
             with zipfile.ZipFile(archive_path, "r") as archive:
+                self._advise_sequential(archive.fp)
                 yield archive
         elif extension == ".7z" and HAS_PY7ZR:
-            with py7zr.SevenZipFile(archive_path, mode="r") as archive:
+            with py7zr.SevenZipFile(
+                archive_path, mode="r", blocksize=self.SEVEN_ZIP_BLOCK_SIZE
+            ) as archive:
+                self._advise_sequential(archive.fp)
                 yield archive
         elif extension == ".rar" and HAS_RARFILE:
+            # rarfile opens its own handles per member, so prefetch by path
+            self._advise_sequential(archive_path)
             with rarfile.RarFile(archive_path) as archive:
                 yield archive
         else:
@@ -313,25 +474,124 @@ class ArchiveProcessor:
             File-like object for streaming.
         """
         if extension == ".zip":
-            with archive.open(file_info["info"]) as stream:
+            with io.BufferedReader(
+                archive.open(file_info["info"]), self.READ_BUFFER_SIZE
+            ) as stream:
                 yield stream
         elif extension == ".7z":
-            # py7zr doesn't support direct streaming, extract to memory
-            temp_buffer = io.BytesIO()
-            archive.extract(targets=[file_info["name"]], path=temp_buffer)
-            temp_buffer.seek(0)
-            yield temp_buffer
+            # py7zr can only push data to a writer, so decompress on a helper
+            # thread into a pipe; memory stays bounded by the pipe buffer
+            read_fd, write_fd = os.pipe()
+            writer = _PipeWriter(write_fd)
+            errors: list[BaseException] = []
+
+            def extract_member() -> None:
+                try:
+                    archive.extract(targets=[file_info["name"]], factory=_PipeWriterFactory(writer))
+                except BaseException as e:
+                    errors.append(e)
+                finally:
+                    writer.close_pipe()
+
+            extractor = threading.Thread(target=extract_member, daemon=True)
+            extractor.start()
+            stream = os.fdopen(read_fd, "rb")
+            try:
+                yield stream
+            finally:
+                # Closing the read end unblocks the writer if the reader stopped early
+                stream.close()
+                extractor.join()
+                archive.reset()
+
+            if errors:
+                raise errors[0]
         elif extension == ".rar":
-            with archive.open(file_info["info"]) as stream:
+            with io.BufferedReader(
+                archive.open(file_info["info"]), self.READ_BUFFER_SIZE
+            ) as stream:
                 yield stream
 
+    def _get_cache_key(self, archive_path: Path) -> tuple[str, int, int]:
+        """Build a cache key that changes whenever the archive file changes."""
+        stat = archive_path.stat()
+        return (str(archive_path), stat.st_mtime_ns, stat.st_size)
+
+    def _cache_get(self, cache: OrderedDict, key: tuple[str, int, int]) -> Any:
+        """Look up an LRU cache entry, marking it as recently used."""
+        with self._cache_lock:
+            value = cache.get(key)
+            if value is not None:
+                cache.move_to_end(key)
+            return value
+
+    def _cache_put(self, cache: OrderedDict, key: tuple[str, int, int], value: Any) -> None:
+        """Store an LRU cache entry, evicting the least recently used one when full."""
+        with self._cache_lock:
+            cache[key] = value
+            cache.move_to_end(key)
+            if len(cache) > self.CONTENTS_CACHE_SIZE:
+                cache.popitem(last=False)
+
+    def _get_zip_infos(self, archive_path: Path) -> list[zipfile.ZipInfo]:
+        """Get the file entries of a ZIP archive, reusing a cached central directory.
+
+        Args:
+            archive_path: Path to the ZIP archive.
+
+        Returns:
+            ZipInfo objects for every non-directory entry.
+        """
+        key = self._get_cache_key(archive_path)
+        infos = self._cache_get(self._zip_info_cache, key)
+        if infos is None:
+            infos = self._read_zip_infos(archive_path, key[2])
+            self._cache_put(self._zip_info_cache, key, infos)
+        return infos
+
+    def _read_zip_infos(self, archive_path: Path, file_size: int) -> list[zipfile.ZipInfo]:
+        """Parse a ZIP's central directory, from a single read of its tail when it fits.
+
+        ZipFile(path) seeks and reads several times to find the end record and central
+        directory; on network shares each round trip costs more than the parsing.
+
+        Args:
+            archive_path: Path to the ZIP archive.
+            file_size: Size of the archive in bytes.
+
+        Returns:
+            ZipInfo objects for every non-directory entry.
+        """
+        tail_size = min(file_size, self.ZIP_TAIL_READ_SIZE)
+        with open(archive_path, "rb", buffering=0) as archive_file:
+            archive_file.seek(file_size - tail_size)
+            tail = archive_file.read(tail_size)
+
+        # ZIP64 end records point at absolute offsets, so those archives are parsed in place
+        if len(tail) == tail_size and b"PK\x06\x07" not in tail:
+            try:
+                with zipfile.ZipFile(io.BytesIO(tail), "r") as zip_file:
+                    infos = [info for info in zip_file.infolist() if not info.is_dir()]
+            except zipfile.BadZipFile:
+                pass  # Central directory starts before the tail
+            else:
+                # Offsets were resolved against the tail; move them back to file positions
+                # so the infos can be passed to ZipFile.open on the real archive
+                shift = file_size - tail_size
+                for info in infos:
+                    info.header_offset += shift
+                    # Bounds the entry's data in ZipFile.open's overlap check
+                    if getattr(info, "_end_offset", None) is not None:
+                        info._end_offset += shift
+                return infos
+
+        with zipfile.ZipFile(archive_path, "r") as zip_file:
+            return [info for info in zip_file.infolist() if not info.is_dir()]
+
     def _get_zip_contents(self, archive_path: Path) -> list[str]:
         """Get contents of ZIP file."""
-        import zipfile
-
         try:
-            with zipfile.ZipFile(archive_path, "r") as zip_file:
-                return [info.filename for info in zip_file.infolist() if not info.is_dir()]
+            return [info.filename for info in self._get_zip_infos(archive_path)]
         except zipfile.BadZipFile as e:
             self.logger.error(f"Corrupted ZIP file: {e}")
             return []
@@ -346,7 +606,9 @@ class ArchiveProcessor:
             return []
 
         try:
-            with py7zr.SevenZipFile(archive_path, mode="r") as archive:
+            with py7zr.SevenZipFile(
+                archive_path, mode="r", blocksize=self.SEVEN_ZIP_BLOCK_SIZE
+            ) as archive:
                 return [name for name in archive.getnames() if not name.endswith("/")]
         except py7zr.exceptions.Bad7zFile as e:
             self.logger.error(f"Corrupted 7z file: {e}")
@@ -372,54 +634,53 @@ class ArchiveProcessor:
         self, archive_path: Path, file_filter: list[str] | None = None
     ) -> list[ExtractedFile]:
         """Extract files from ZIP archive with improved error handling."""
-        import zipfile
-
-        temp_dir = Path(tempfile.mkdtemp(prefix="romshelf_"))
-        self._temp_dirs.append(temp_dir)
+        temp_dir = self._create_temp_dir()
         extracted_files = []
+        extensions = frozenset(ext.lower() for ext in file_filter) if file_filter else None
 
         try:
-            with zipfile.ZipFile(archive_path, "r") as zip_file:
-                # Check for zip bomb
-                total_uncompressed = sum(info.file_size for info in zip_file.infolist())
-                compression_ratio = total_uncompressed / archive_path.stat().st_size
-
-                if compression_ratio > 100:
-                    self.logger.warning(
-                        f"High compression ratio ({compression_ratio:.1f}x), " f"possible zip bomb"
-                    )
-
-                for info in zip_file.infolist():
-                    if info.is_dir():
-                        continue
-
-                    # Security check for path traversal
-                    if ".." in info.filename or info.filename.startswith("/"):
-                        self.logger.warning(f"Skipping potentially malicious path: {info.filename}")
-                        continue
-
-                    # Apply file filter if provided
-                    if file_filter:
-                        file_ext = Path(info.filename).suffix.lower()
-                        if file_ext not in file_filter:
-                            continue
-
-                    # Extract file with size check
-                    if info.file_size > self.max_memory_size:
-                        # Stream large files
-                        extracted_path = temp_dir / Path(info.filename).name
-                        with zip_file.open(info) as source:
-                            with open(extracted_path, "wb") as target:
-                                while chunk := source.read(self.chunk_size):
-                                    target.write(chunk)
-                    else:
-                        # Extract normally for small files
-                        extracted_path = temp_dir / Path(info.filename).name
-                        with zip_file.open(info) as source:
-                            with open(extracted_path, "wb") as target:
-                                target.write(source.read())
-
-                    extracted_files.append(ExtractedFile(info.filename, extracted_path, temp_dir))
+            infos = self._get_zip_infos(archive_path)
+            self._advise_sequential(archive_path)
+
+            # Check for zip bomb, stopping as soon as the ratio is exceeded.
+            # Archives under 1MB cannot expand to anything worth warning about.
+            archive_size = archive_path.stat().st_size
+            if archive_size >= 1024 * 1024:
+                threshold = archive_size * 100
+                total_uncompressed = 0
+                for info in infos:
+                    total_uncompressed += info.file_size
+                    if total_uncompressed > threshold:
+                        self.logger.warning("High compression ratio (over 100x), possible zip bomb")
+                        break
+
+            # Apply file filter if provided
+            candidates = infos
+            if extensions is not None:
+                candidates = [info for info in infos if _suffix_lower(info.filename) in extensions]
+
+            entries = []
+            for info in candidates:
+                # Security check for path traversal
+                if ".." in info.filename or info.filename.startswith("/"):
+                    self.logger.warning(f"Skipping potentially malicious path: {info.filename}")
+                    continue
+
+                entries.append(info)
+
+            # Targets are assigned up front so concurrent workers never share a file
+            targets = _target_paths([info.filename for info in entries], temp_dir)
+
+            # Entries are independent, so extract them concurrently. Each worker
+            # opens its own handle because ZipFile is not safe to share across threads.
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = [
+                    executor.submit(self._extract_one_zip_entry, archive_path, info, target)
+                    for info, target in zip(entries, targets, strict=True)
+                ]
+                # Collect in archive order so results don't depend on thread timing
+                for info, future in zip(entries, futures, strict=True):
+                    extracted_files.append(ExtractedFile(info.filename, future.result(), temp_dir))
 
         except zipfile.BadZipFile as e:
             self.logger.error(f"Failed to extract ZIP: {e}")
@@ -431,6 +692,166 @@ class ArchiveProcessor:
 
         return extracted_files
 
+    def _extract_one_zip_entry(
+        self, archive_path: Path, info: zipfile.ZipInfo, extracted_path: Path
+    ) -> Path:
+        """Extract a single ZIP entry to its target path.
+
+        Args:
+            archive_path: Path to the ZIP archive.
+            info: Cached entry from _get_zip_infos, with offsets into the archive file.
+            extracted_path: File to extract the entry to.
+
+        Returns:
+            Path to the extracted file.
+        """
+        # Stored entries are raw bytes in the archive, so copy them in-kernel; the
+        # cached offsets locate them without parsing the central directory again
+        if info.compress_type == zipfile.ZIP_STORED and not info.flag_bits & 0x1:
+            with open(archive_path, "rb", buffering=0) as archive_file:
+                data_offset = self._get_zip_data_offset(archive_file, info)
+            if data_offset is not None and self._copy_file_range(
+                archive_path, extracted_path, data_offset, info.file_size
+            ):
+                return extracted_path
+
+        with zipfile.ZipFile(archive_path, "r") as zip_file:
+            self._advise_sequential(zip_file.fp)
+
+            # Copy in fixed-size chunks so memory stays bounded regardless of entry size
+            with io.BufferedReader(zip_file.open(info), self.READ_BUFFER_SIZE) as source:
+                with open(extracted_path, "wb") as target:
+                    self._copy_stream(source, target, info.file_size)
+
+        return extracted_path
+
+    def _copy_stream(self, source: BinaryIO, target: BinaryIO, size: int) -> None:
+        """Copy a decompressing stream to a file in chunk_size pieces.
+
+        Large entries are copied through a reader thread so decompression and
+        disk writes overlap; small ones are not worth the thread start-up.
+
+        Args:
+            source: Stream to read from.
+            target: File to write to.
+            size: Expected number of bytes, or 0 if unknown.
+        """
+        self._preallocate(target.fileno(), size)
+
+        if size < self.PIPELINE_MIN_SIZE:
+            shutil.copyfileobj(source, target, self.chunk_size)
+            return
+
+        chunks: queue.Queue[bytes | None] = queue.Queue(maxsize=self.PIPELINE_QUEUE_DEPTH)
+        errors: list[BaseException] = []
+        stop = threading.Event()
+
+        def read_chunks() -> None:
+            try:
+                while not stop.is_set() and (chunk := source.read(self.chunk_size)):
+                    chunks.put(chunk)
+            except BaseException as e:
+                errors.append(e)
+            finally:
+                chunks.put(None)
+
+        reader = threading.Thread(target=read_chunks, daemon=True)
+        reader.start()
+        try:
+            while (chunk := chunks.get()) is not None:
+                target.write(chunk)
+        finally:
+            # Drain the queue so a reader blocked on a full queue can exit
+            stop.set()
+            while reader.is_alive():
+                try:
+                    chunks.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            reader.join()
+
+        if errors:
+            raise errors[0]
+
+    def _preallocate(self, fd: int, size: int) -> None:
+        """Reserve disk space for an extracted file so its blocks are allocated up front.
+
+        Args:
+            fd: File descriptor of the output file.
+            size: Final size of the file, or 0 if unknown.
+        """
+        if size <= 0 or not hasattr(os, "posix_fallocate"):
+            return
+
+        try:
+            os.posix_fallocate(fd, 0, size)
+        except OSError:
+            pass  # Filesystem doesn't support preallocation
+
+    def _get_zip_data_offset(self, archive_file: BinaryIO, info: zipfile.ZipInfo) -> int | None:
+        """Get the offset of an entry's data within a ZIP archive.
+
+        Args:
+            archive_file: ZIP archive opened for binary reading.
+            info: ZipInfo of the entry.
+
+        Returns:
+            Absolute offset of the entry data, or None if the local header is invalid.
+        """
+        archive_file.seek(info.header_offset)
+        header = archive_file.read(30)
+        if len(header) != 30 or header[:4] != b"PK\x03\x04":
+            return None
+
+        name_length = int.from_bytes(header[26:28], "little")
+        extra_length = int.from_bytes(header[28:30], "little")
+        return info.header_offset + 30 + name_length + extra_length
+
+    def _copy_file_range(
+        self, source_path: Path, target_path: Path, offset: int, count: int
+    ) -> bool:
+        """Copy a byte range between files without passing through userspace.
+
+        Args:
+            source_path: File to copy from.
+            target_path: File to create with the copied bytes.
+            offset: Offset in the source file to start copying from.
+            count: Number of bytes to copy.
+
+        Returns:
+            True if the range was copied, False if the caller should fall back to a buffered copy.
+        """
+        copy_range = getattr(os, "copy_file_range", None)
+        if copy_range is None and not hasattr(os, "sendfile"):
+            return False
+
+        try:
+            src_fd = os.open(source_path, os.O_RDONLY)
+            try:
+                dst_fd = os.open(target_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+                try:
+                    self._preallocate(dst_fd, count)
+                    remaining = count
+                    while remaining > 0:
+                        step = min(remaining, 1 << 20)
+                        if copy_range is not None:
+                            copied = copy_range(src_fd, dst_fd, step, offset)
+                        else:
+                            copied = os.sendfile(dst_fd, src_fd, offset, step)
+                        if copied == 0:
+                            break
+                        offset += copied
+                        remaining -= copied
+                finally:
+                    os.close(dst_fd)
+            finally:
+                os.close(src_fd)
+        except OSError as e:
+            self.logger.debug(f"In-kernel copy unavailable, falling back: {e}")
+            return False
+
+        return remaining == 0
+
     def _extract_7z_files(
         self, archive_path: Path, file_filter: list[str] | None = None
     ) -> list[ExtractedFile]:
@@ -439,13 +860,22 @@ class ArchiveProcessor:
             self.logger.error("py7zr not installed")
             return []
 
-        temp_dir = Path(tempfile.mkdtemp(prefix="romshelf_"))
-        self._temp_dirs.append(temp_dir)
+        temp_dir = self._create_temp_dir()
         extracted_files = []
+        extensions = frozenset(ext.lower() for ext in file_filter) if file_filter else None
 
         try:
-            with py7zr.SevenZipFile(archive_path, mode="r") as archive:
-                for name in archive.getnames():
+            with py7zr.SevenZipFile(
+                archive_path, mode="r", blocksize=self.SEVEN_ZIP_BLOCK_SIZE
+            ) as archive:
+                self._advise_sequential(archive.fp)
+                # Apply file filter
+                candidates = archive.getnames()
+                if extensions is not None:
+                    candidates = [name for name in candidates if _suffix_lower(name) in extensions]
+
+                names = []
+                for name in candidates:
                     if name.endswith("/"):
                         continue
 
@@ -454,31 +884,20 @@ class ArchiveProcessor:
                         self.logger.warning(f"Skipping potentially malicious path: {name}")
                         continue
 
-                    # Apply file filter
-                    if file_filter:
-                        file_ext = Path(name).suffix.lower()
-                        if file_ext not in file_filter:
-                            continue
+                    names.append(name)
 
-                    # Extract file
-                    try:
-                        archive.extract(temp_dir, [name])
-                        original_path = temp_dir / name
-                        extracted_path = temp_dir / Path(name).name
+                if self._extract_native(".7z", archive_path, names, temp_dir):
+                    return [
+                        ExtractedFile(name, temp_dir / _basename(name), temp_dir) for name in names
+                    ]
 
-                        # Flatten directory structure
-                        if original_path != extracted_path and original_path.exists():
-                            original_path.rename(extracted_path)
-                            # Clean up empty directories
-                            try:
-                                original_path.parent.rmdir()
-                            except OSError:
-                                pass
+                if not names:
+                    return extracted_files
 
-                        extracted_files.append(ExtractedFile(name, extracted_path, temp_dir))
-
-                    except Exception as e:
-                        self.logger.error(f"Failed to extract {name}: {e}")
+                # Solid archives are decoded from the start of the block on every
+                # extract call, so extract all selected members in a single pass
+                archive.extract(temp_dir, names)
+                extracted_files.extend(self._flatten_extracted(names, temp_dir))
 
         except py7zr.exceptions.Bad7zFile as e:
             self.logger.error(f"Failed to extract 7z: {e}")
@@ -495,13 +914,22 @@ class ArchiveProcessor:
             self.logger.error("rarfile not installed")
             return []
 
-        temp_dir = Path(tempfile.mkdtemp(prefix="romshelf_"))
-        self._temp_dirs.append(temp_dir)
+        temp_dir = self._create_temp_dir()
         extracted_files = []
+        extensions = frozenset(ext.lower() for ext in file_filter) if file_filter else None
 
         try:
+            self._advise_sequential(archive_path)
             with rarfile.RarFile(archive_path) as rar:
-                for info in rar.infolist():
+                # Apply file filter
+                candidates = rar.infolist()
+                if extensions is not None:
+                    candidates = [
+                        info for info in candidates if _suffix_lower(info.filename) in extensions
+                    ]
+
+                infos = []
+                for info in candidates:
                     if info.is_dir():
                         continue
 
@@ -510,34 +938,25 @@ class ArchiveProcessor:
                         self.logger.warning(f"Skipping potentially malicious path: {info.filename}")
                         continue
 
-                    # Apply file filter
-                    if file_filter:
-                        file_ext = Path(info.filename).suffix.lower()
-                        if file_ext not in file_filter:
-                            continue
+                    infos.append(info)
+
+                names = [info.filename for info in infos]
+                if self._extract_native(".rar", archive_path, names, temp_dir):
+                    return [
+                        ExtractedFile(name, temp_dir / _basename(name), temp_dir) for name in names
+                    ]
 
+                extracted_names = []
+                for info in infos:
                     # Extract file
                     try:
                         rar.extract(info, temp_dir)
-                        original_path = temp_dir / info.filename
-                        extracted_path = temp_dir / Path(info.filename).name
-
-                        # Flatten directory structure
-                        if original_path != extracted_path and original_path.exists():
-                            original_path.rename(extracted_path)
-                            # Clean up empty directories
-                            try:
-                                original_path.parent.rmdir()
-                            except OSError:
-                                pass
-
-                        extracted_files.append(
-                            ExtractedFile(info.filename, extracted_path, temp_dir)
-                        )
-
+                        extracted_names.append(info.filename)
                     except Exception as e:
                         self.logger.error(f"Failed to extract {info.filename}: {e}")
 
+                extracted_files.extend(self._flatten_extracted(extracted_names, temp_dir))
+
         except rarfile.BadRarFile as e:
             self.logger.error(f"Failed to extract RAR: {e}")
         except Exception as e:
@@ -545,17 +964,191 @@ class ArchiveProcessor:
 
         return extracted_files
 
-    def cleanup(self) -> None:
-        """Clean up all temporary directories."""
-        for temp_dir in self._temp_dirs:
+    def _advise_sequential(self, source: Path | BinaryIO | None) -> None:
+        """Tell the kernel an archive will be read sequentially and prefetch it.
+
+        Args:
+            source: Archive path or an open file object reading the archive.
+        """
+        if source is None or not hasattr(os, "posix_fadvise"):
+            return
+
+        try:
+            if isinstance(source, Path):
+                fd = os.open(source, os.O_RDONLY)
+                try:
+                    os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+                finally:
+                    os.close(fd)
+            else:
+                fd = source.fileno()
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        except (OSError, ValueError):
+            pass  # Advice is best effort
+
+    def _create_temp_dir(self) -> Path:
+        """Create a per-archive extraction directory under the session temp root."""
+        with self._temp_lock:
+            if self._session_root is None:
+                self._session_root = Path(tempfile.mkdtemp(prefix="romshelf_session_"))
+            session_root = self._session_root
+
+        temp_dir = session_root / f"a{next(self._temp_counter)}"
+        temp_dir.mkdir()
+        return temp_dir
+
+    def _flatten_extracted(self, names: list[str], temp_dir: Path) -> list[ExtractedFile]:
+        """Move extracted members to the top of the temp directory.
+
+        Renames are done in one pass, followed by a single bottom-up sweep
+        that removes the directories the archive layout left behind.
+
+        Args:
+            names: Archive member names that were extracted into temp_dir.
+            temp_dir: Directory the members were extracted into.
+
+        Returns:
+            List of extracted files at their flattened locations.
+        """
+        extracted_files = []
+        has_subdirs = False
+        # Top-level members already own their names; a nested member whose name is
+        # taken stays where the archive put it instead of overwriting another file
+        taken = {name.casefold() for name in names if "/" not in name}
+
+        for name in names:
+            original_path = os.path.join(temp_dir, name)
+            basename = _basename(name)
+            extracted_path = temp_dir / basename
+
+            if "/" in name:
+                key = basename.casefold()
+                if key in taken:
+                    extracted_files.append(ExtractedFile(name, Path(original_path), temp_dir))
+                    continue
+                taken.add(key)
+
+            if os.path.normpath(original_path) != os.path.normpath(extracted_path):
+                has_subdirs = True
+                try:
+                    os.rename(original_path, extracted_path)
+                except OSError as e:
+                    self.logger.error(f"Failed to extract {name}: {e}")
+                    continue
+
+            extracted_files.append(ExtractedFile(name, extracted_path, temp_dir))
+
+        if has_subdirs:
+            for root, dirs, _ in os.walk(temp_dir, topdown=False):
+                for directory in dirs:
+                    try:
+                        os.rmdir(os.path.join(root, directory))
+                    except OSError:
+                        pass  # Directory still holds files
+
+        return extracted_files
+
+    def _extract_native(
+        self, extension: str, archive_path: Path, names: list[str], temp_dir: Path
+    ) -> bool:
+        """Extract archive members with the system 7z/unrar binary.
+
+        Members are extracted without their directory structure in a single
+        process run, so solid archives are only decompressed once. Member sets
+        the tool can't extract safely that way (names that would collide once
+        flattened, or that unrar would read as wildcards) are left to the caller.
+
+        Args:
+            extension: Archive extension selecting the native tool.
+            archive_path: Path to the archive file.
+            names: Archive member names to extract.
+            temp_dir: Directory to extract into.
+
+        Returns:
+            True if every member was extracted, False if the caller should fall back.
+        """
+        tool = self._native_tools.get(extension)
+        if tool is None or not names:
+            return False
+
+        # "e" drops directories, so members sharing a file name would overwrite each other
+        if len({_basename(name).casefold() for name in names}) != len(names):
+            return False
+
+        if extension == ".7z":
+            # -spd disables wildcard matching so names like "Game [!].sfc" are literal
+            command = [tool, "e", "-y", "-bd", "-spd", f"-o{temp_dir}", "--", str(archive_path)]
+            command.extend(names)
+        else:
+            # unrar has no switch for literal names, so wildcard characters fall back
+            if any(char in name for name in names for char in "*?["):
+                return False
+            command = [tool, "e", "-o+", "-idq", "-y", "--", str(archive_path), *names]
+            command.append(f"{temp_dir}{os.sep}")
+
+        try:
+            result = subprocess.run(
+                command,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                timeout=self.extraction_timeout,
+                # Avoid flashing a console window from the GUI on Windows
+                creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),
+            )
+        except subprocess.TimeoutExpired:
+            self.logger.warning(
+                f"{Path(tool).name} timed out after {self.extraction_timeout}s "
+                f"on {archive_path.name}"
+            )
+            self._remove_partial_output(names, temp_dir)
+            return False
+        except OSError as e:
+            self.logger.warning(f"Failed to run {tool}: {e}")
+            return False
+
+        if result.returncode != 0:
+            self.logger.warning(
+                f"{Path(tool).name} failed on {archive_path.name} (exit {result.returncode}): "
+                f"{result.stderr.decode(errors='replace').strip()}"
+            )
+            self._remove_partial_output(names, temp_dir)
+            return False
+
+        return all((temp_dir / _basename(name)).exists() for name in names)
+
+    def _remove_partial_output(self, names: list[str], temp_dir: Path) -> None:
+        """Delete whatever a failed native extraction left before falling back.
+
+        Args:
+            names: Archive member names the tool was asked to extract.
+            temp_dir: Directory the tool extracted into.
+        """
+        for name in names:
             try:
-                if temp_dir.exists():
-                    shutil.rmtree(temp_dir)
-                    self.logger.debug(f"Cleaned up temp directory: {temp_dir}")
-            except OSError as e:
-                self.logger.warning(f"Failed to clean up {temp_dir}: {e}")
+                os.unlink(temp_dir / _basename(name))
+            except OSError:
+                pass  # Never written
+
+    def cleanup(self) -> None:
+        """Clean up all temporary directories and cached archive listings."""
+        with self._cache_lock:
+            self._contents_cache.clear()
+            self._zip_info_cache.clear()
+
+        with self._temp_lock:
+            session_root, self._session_root = self._session_root, None
 
-        self._temp_dirs.clear()
+        if session_root is None:
+            return
+
+        try:
+            if session_root.exists():
+                shutil.rmtree(session_root)
+                self.logger.debug(f"Cleaned up temp directory: {session_root}")
+        except OSError as e:
+            self.logger.warning(f"Failed to clean up {session_root}: {e}")
 
     def __del__(self) -> None:
         """Cleanup on deletion."""
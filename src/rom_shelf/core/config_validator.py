@@ -1,17 +1,62 @@
 """Configuration validation and environment management for RomShelf."""
 
+import functools
+import hashlib
 import json
 import logging
 import os
+import sys
 from pathlib import Path
 from typing import Any
 
-from pydantic import BaseModel, Field, ValidationError, field_validator
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, ValidationError, field_validator
+
+from .logging_config import Environment, detect_environment
+
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import msgspec
+
+    HAS_MSGSPEC = True
+except ImportError:
+    HAS_MSGSPEC = False
+
+_logger = logging.getLogger(__name__)
+
+
+def _json_loads(data: bytes) -> Any:
+    """Parse JSON bytes, using orjson or msgspec when available."""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    if HAS_MSGSPEC:
+        try:
+            return msgspec.json.decode(data)
+        except msgspec.DecodeError as e:
+            # Surface malformed files the same way as the stdlib parser
+            raise json.JSONDecodeError(str(e), data.decode("utf-8", "replace"), 0) from e
+    return json.loads(data)
+
+
+def _json_dumps(data: Any) -> bytes:
+    """Serialize data to indented JSON bytes, using orjson or msgspec when available."""
+    if HAS_ORJSON:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    if HAS_MSGSPEC:
+        return msgspec.json.format(msgspec.json.encode(data), indent=2)
+    return json.dumps(data, indent=2).encode("utf-8")
 
 
 class PlatformConfig(BaseModel):
     """Platform-specific configuration."""
 
+    model_config = ConfigDict(validate_assignment=True)
+
     name: str
     enabled: bool = True
     rom_extensions: list[str] = Field(default_factory=list)
@@ -19,27 +64,54 @@ class PlatformConfig(BaseModel):
     emulator_path: str | None = None
 
     @field_validator("rom_extensions")
-    def validate_extensions(self, v: list[str]) -> list[str]:
+    @classmethod
+    def validate_extensions(cls, v: list[str]) -> list[str]:
         """Ensure extensions start with a dot."""
         return [ext if ext.startswith(".") else f".{ext}" for ext in v]
 
     @field_validator("rom_paths")
-    def validate_paths(self, v: list[str]) -> list[str]:
+    @classmethod
+    def validate_paths(cls, v: list[str]) -> list[str]:
         """Validate that ROM paths exist."""
         valid_paths = []
-        for path_str in v:
-            path = Path(path_str)
-            if path.exists():
-                valid_paths.append(str(path.absolute()))
+        # Both branches store the same normalized absolute path
+        abs_paths = [os.path.abspath(path_str) for path_str in v]
+        if len(v) <= 2:
+            for path_str, abs_path in zip(v, abs_paths, strict=True):
+                if os.path.exists(abs_path):
+                    valid_paths.append(abs_path)
+                else:
+                    _logger.warning("ROM path does not exist: %s", path_str)
+            return valid_paths
+
+        # List each parent directory once instead of stat-ing every path
+        listings: dict[str, set[str] | None] = {}
+        for abs_path in abs_paths:
+            parent = os.path.dirname(abs_path)
+            if parent not in listings:
+                try:
+                    with os.scandir(parent) as it:
+                        listings[parent] = {entry.name for entry in it}
+                except OSError:
+                    listings[parent] = None
+
+        for path_str, abs_path in zip(v, abs_paths, strict=True):
+            parent, name = os.path.split(abs_path)
+            names = listings[parent]
+            # Names missing from the listing (case differences, roots) and parents that
+            # couldn't be listed get a direct check
+            if (names is not None and name in names) or os.path.exists(abs_path):
+                valid_paths.append(abs_path)
             else:
-                logger = logging.getLogger(__name__)
-                logger.warning(f"ROM path does not exist: {path_str}")
+                _logger.warning("ROM path does not exist: %s", path_str)
         return valid_paths
 
 
 class DatabaseConfig(BaseModel):
     """Database configuration."""
 
+    model_config = ConfigDict(validate_assignment=True)
+
     path: str = Field(default="romshelf.db")
     version: int = Field(default=1, ge=1)
     cache_enabled: bool = True
@@ -49,7 +121,8 @@ class DatabaseConfig(BaseModel):
     wal_mode: bool = True  # Write-Ahead Logging for better concurrency
 
     @field_validator("path")
-    def validate_db_path(self, v: str) -> str:
+    @classmethod
+    def validate_db_path(cls, v: str) -> str:
         """Ensure database path is writable."""
         db_path = Path(v)
         db_dir = db_path.parent
@@ -61,6 +134,8 @@ class DatabaseConfig(BaseModel):
 class ScannerConfig(BaseModel):
     """Scanner configuration."""
 
+    model_config = ConfigDict(validate_assignment=True)
+
     num_workers: int = Field(default=4, ge=1, le=32)
     batch_size: int = Field(default=100, ge=10, le=1000)
     skip_hidden: bool = True
@@ -71,7 +146,8 @@ class ScannerConfig(BaseModel):
     temp_dir: str | None = None
 
     @field_validator("temp_dir")
-    def validate_temp_dir(self, v: str | None) -> str | None:
+    @classmethod
+    def validate_temp_dir(cls, v: str | None) -> str | None:
         """Validate temp directory if provided."""
         if v:
             temp_path = Path(v)
@@ -86,6 +162,8 @@ class ScannerConfig(BaseModel):
 class UIConfig(BaseModel):
     """UI configuration."""
 
+    model_config = ConfigDict(validate_assignment=True)
+
     theme: str = Field(default="dark")
     language: str = Field(default="en")
     show_splash_screen: bool = True
@@ -95,7 +173,8 @@ class UIConfig(BaseModel):
     enable_animations: bool = True
 
     @field_validator("theme")
-    def validate_theme(self, v: str) -> str:
+    @classmethod
+    def validate_theme(cls, v: str) -> str:
         """Validate theme name."""
         valid_themes = {"light", "dark", "auto", "high_contrast"}
         if v.lower() not in valid_themes:
@@ -103,7 +182,8 @@ class UIConfig(BaseModel):
         return v.lower()
 
     @field_validator("default_view")
-    def validate_view(self, v: str) -> str:
+    @classmethod
+    def validate_view(cls, v: str) -> str:
         """Validate default view."""
         valid_views = {"grid", "list", "table", "tiles"}
         if v.lower() not in valid_views:
@@ -114,6 +194,8 @@ class UIConfig(BaseModel):
 class PerformanceConfig(BaseModel):
     """Performance tuning configuration."""
 
+    model_config = ConfigDict(validate_assignment=True)
+
     enable_multithreading: bool = True
     cache_thumbnails: bool = True
     thumbnail_cache_size_mb: int = Field(default=500, ge=50, le=5000)
@@ -126,6 +208,8 @@ class PerformanceConfig(BaseModel):
 class RetroAchievementsConfig(BaseModel):
     """RetroAchievements configuration."""
 
+    model_config = ConfigDict(validate_assignment=True)
+
     enabled: bool = False
     username: str | None = None
     api_key: str | None = None
@@ -137,6 +221,8 @@ class RetroAchievementsConfig(BaseModel):
 class AppConfig(BaseModel):
     """Main application configuration."""
 
+    model_config = ConfigDict(validate_assignment=True)
+
     version: str = Field(default="1.0.0")
     platforms: dict[str, PlatformConfig] = Field(default_factory=dict)
     database: DatabaseConfig = Field(default_factory=DatabaseConfig)
@@ -149,6 +235,25 @@ class AppConfig(BaseModel):
     telemetry_enabled: bool = False
 
 
+# Built once so repeated validations reuse the compiled validator
+_APP_CONFIG_ADAPTER = TypeAdapter(AppConfig)
+
+
+@functools.lru_cache(maxsize=1)
+def _default_config_path() -> Path:
+    """Get the default configuration file path, creating its directory once."""
+    if sys.platform == "win32":
+        base = Path(os.environ.get("APPDATA", Path.home() / "AppData" / "Roaming"))
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Application Support"
+    else:
+        base = Path.home() / ".config"
+
+    config_dir = base / "RomShelf"
+    config_dir.mkdir(parents=True, exist_ok=True)
+    return config_dir / "config.json"
+
+
 class ConfigValidator:
     """Validates and manages application configuration."""
 
@@ -159,24 +264,13 @@ class ConfigValidator:
             config_path: Path to the configuration file.
         """
         self.logger = logging.getLogger(__name__)
-        self.config_path = config_path or self._get_default_config_path()
+        self.config_path = config_path or _default_config_path()
         self.config: AppConfig | None = None
         self._validation_errors: list[str] = []
-
-    def _get_default_config_path(self) -> Path:
-        """Get the default configuration file path."""
-        import sys
-
-        if sys.platform == "win32":
-            base = Path(os.environ.get("APPDATA", Path.home() / "AppData" / "Roaming"))
-        elif sys.platform == "darwin":
-            base = Path.home() / "Library" / "Application Support"
-        else:
-            base = Path.home() / ".config"
-
-        config_dir = base / "RomShelf"
-        config_dir.mkdir(parents=True, exist_ok=True)
-        return config_dir / "config.json"
+        # fsync is skipped in debug/test runs where durability doesn't matter
+        self._fsync = detect_environment() not in (Environment.DEBUG, Environment.TEST)
+        # Digest of the bytes last written, used to skip no-op saves
+        self._last_saved_hash: bytes | None = None
 
     def load_config(self) -> AppConfig:
         """Load and validate configuration from file.
@@ -189,18 +283,18 @@ class ConfigValidator:
         """
         if self.config_path.exists():
             try:
-                with open(self.config_path, encoding="utf-8") as f:
-                    config_data = json.load(f)
+                with open(self.config_path, "rb") as f:
+                    config_data = _json_loads(f.read())
                 self.config = self._validate_config(config_data)
-                self.logger.info(f"Configuration loaded from {self.config_path}")
+                self.logger.info("Configuration loaded from %s", self.config_path)
             except json.JSONDecodeError as e:
-                self.logger.error(f"Invalid JSON in configuration file: {e}")
+                self.logger.error("Invalid JSON in configuration file: %s", e)
                 self.config = self._get_default_config()
             except ValidationError as e:
-                self.logger.error(f"Configuration validation failed: {e}")
+                self.logger.error("Configuration validation failed: %s", e)
                 self.config = self._get_default_config()
             except Exception as e:
-                self.logger.error(f"Failed to load configuration: {e}")
+                self.logger.error("Failed to load configuration: %s", e)
                 self.config = self._get_default_config()
         else:
             self.logger.info("No configuration file found, using defaults")
@@ -222,31 +316,43 @@ class ConfigValidator:
             ValidationError: If validation fails.
         """
         try:
-            config = AppConfig(**config_data)
+            config = _APP_CONFIG_ADAPTER.validate_python(config_data)
             self._perform_additional_validation(config)
             return config
         except ValidationError as e:
             self._validation_errors = [str(err) for err in e.errors()]
             raise
 
-    def _perform_additional_validation(self, config: AppConfig) -> None:
-        """Perform additional validation beyond Pydantic."""
+    def _perform_additional_validation(
+        self, config: AppConfig, changed_sections: set[str] | None = None
+    ) -> None:
+        """Perform additional validation beyond Pydantic.
+
+        Args:
+            config: Configuration to check.
+            changed_sections: Top-level sections that changed. Checks that only involve
+                other sections are skipped. None checks everything.
+        """
         errors = []
 
         # Check for conflicting settings
-        if config.performance.memory_limit_mb < config.performance.thumbnail_cache_size_mb:
-            errors.append(
-                "Memory limit is less than thumbnail cache size. "
-                "This may cause performance issues."
-            )
+        if changed_sections is None or "performance" in changed_sections:
+            if config.performance.memory_limit_mb < config.performance.thumbnail_cache_size_mb:
+                errors.append(
+                    "Memory limit is less than thumbnail cache size. "
+                    "This may cause performance issues."
+                )
 
         # Validate RetroAchievements settings
-        if config.retroachievements.enabled:
-            if not config.retroachievements.username or not config.retroachievements.api_key:
-                errors.append("RetroAchievements is enabled but credentials are missing")
+        if changed_sections is None or "retroachievements" in changed_sections:
+            if config.retroachievements.enabled:
+                if not config.retroachievements.username or not config.retroachievements.api_key:
+                    errors.append("RetroAchievements is enabled but credentials are missing")
 
         # Check database settings
-        if config.database.max_connections < config.scanner.num_workers:
+        if (
+            changed_sections is None or not changed_sections.isdisjoint({"database", "scanner"})
+        ) and config.database.max_connections < config.scanner.num_workers:
             self.logger.warning(
                 "Database max_connections is less than scanner workers. "
                 "This may cause connection pool exhaustion."
@@ -254,7 +360,7 @@ class ConfigValidator:
 
         if errors:
             for error in errors:
-                self.logger.warning(f"Configuration warning: {error}")
+                self.logger.warning("Configuration warning: %s", error)
 
     def _get_default_config(self) -> AppConfig:
         """Get default configuration."""
@@ -269,14 +375,45 @@ class ConfigValidator:
         try:
             config_data = self.config.model_dump()
 
-            # Save configuration as-is
+            # Save configuration as-is, skipping the write when nothing changed
+            payload = _json_dumps(config_data)
+            digest = hashlib.blake2b(payload, digest_size=16).digest()
+            if digest == self._last_saved_hash:
+                return
+            try:
+                existing = self.config_path.read_bytes()
+            except FileNotFoundError:
+                existing = b""
+            if existing != payload:
+                self._write_atomic(payload)
+            self._last_saved_hash = digest
+
+            self.logger.info("Configuration saved to %s", self.config_path)
+        except Exception as e:
+            self.logger.error("Failed to save configuration: %s", e)
 
-            with open(self.config_path, "w", encoding="utf-8") as f:
-                json.dump(config_data, f, indent=2)
+    def _write_atomic(self, payload: bytes) -> None:
+        """Write the configuration file via a temp file and rename.
 
-            self.logger.info(f"Configuration saved to {self.config_path}")
-        except Exception as e:
-            self.logger.error(f"Failed to save configuration: {e}")
+        Args:
+            payload: Serialized configuration.
+        """
+        tmp_path = self.config_path.with_suffix(self.config_path.suffix + ".tmp")
+        fd = os.open(
+            tmp_path,
+            os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0),
+            0o644,
+        )
+        try:
+            view = memoryview(payload)
+            while view:
+                written = os.write(fd, view)
+                view = view[written:]
+            if self._fsync:
+                os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, self.config_path)
 
     def get_validation_errors(self) -> list[str]:
         """Get list of validation errors from last validation attempt.
@@ -301,28 +438,39 @@ class ConfigValidator:
 
         try:
             parts = path.split(".")
-            config_dict = self.config.model_dump()
 
-            # Navigate to the setting
-            current = config_dict
+            # Walk the live models; assignment validates just the changed field
+            target: Any = self.config
             for part in parts[:-1]:
-                if part not in current:
-                    self.logger.error(f"Invalid setting path: {path}")
-                    return False
-                current = current[part]
-
-            # Update the value
-            current[parts[-1]] = value
-
-            # Validate the new configuration
-            self.config = self._validate_config(config_dict)
+                if not isinstance(target, BaseModel):
+                    break
+                target = getattr(target, part, None)
+
+            if isinstance(target, BaseModel):
+                try:
+                    setattr(target, parts[-1], value)
+                except ValidationError as e:
+                    self._validation_errors = [str(err) for err in e.errors()]
+                    raise
+                self._perform_additional_validation(self.config, {parts[0]})
+            else:
+                # Settings inside dict fields (platform entries) need a full revalidation
+                config_dict = self.config.model_dump()
+                current = config_dict
+                for part in parts[:-1]:
+                    if not isinstance(current, dict) or part not in current:
+                        self.logger.error("Invalid setting path: %s", path)
+                        return False
+                    current = current[part]
+                current[parts[-1]] = value
+                self.config = self._validate_config(config_dict)
             self.save_config()
 
-            self.logger.info(f"Updated setting {path} = {value}")
+            self.logger.info("Updated setting %s = %s", path, value)
             return True
 
         except Exception as e:
-            self.logger.error(f"Failed to update setting {path}: {e}")
+            self.logger.error("Failed to update setting %s: %s", path, e)
             return False
 
 
@@ -1,16 +1,20 @@
 """Extension handler system for different file types."""
 
+import sys
 from dataclasses import dataclass
-from enum import Enum
+from enum import IntEnum
 from pathlib import Path
 
 
-class FileHandlingType(Enum):
-    """Types of file handling strategies."""
+class FileHandlingType(IntEnum):
+    """Types of file handling strategies.
 
-    DIRECT = "direct"  # Single file, use as-is
-    ARCHIVE = "archive"  # Needs extraction (7z, zip, rar)
-    MULTI_FILE = "multi_file"  # Multiple related files (cue+bin)
+    An IntEnum so members hash and compare as plain ints in the per-type lookups.
+    """
+
+    DIRECT = 1  # Single file, use as-is
+    ARCHIVE = 2  # Needs extraction (7z, zip, rar)
+    MULTI_FILE = 3  # Multiple related files (cue+bin)
 
 
 @dataclass
@@ -36,6 +40,13 @@ class ExtensionHandlerRegistry:
     def __init__(self) -> None:
         """Initialize the registry with default handlers."""
         self._handlers: dict[str, ExtensionHandler] = {}
+        # Extension sets and ordered tuples per handling type, rebuilt lazily after registrations
+        self._extensions_by_type: dict[FileHandlingType, frozenset[str]] = {}
+        self._by_type: dict[FileHandlingType, tuple[str, ...]] = {t: () for t in FileHandlingType}
+        self._all_extensions: tuple[str, ...] = ()
+        self._dirty = True
+        # Bound lookup for the per-file hot path
+        self._get_handler_fast = self._handlers.get
         self._initialize_archive_handlers()
 
     def _initialize_archive_handlers(self) -> None:
@@ -47,7 +58,34 @@ class ExtensionHandlerRegistry:
 
     def register_handler(self, handler: ExtensionHandler) -> None:
         """Register an extension handler."""
-        self._handlers[handler.extension.lower()] = handler
+        # Keys are normalized once here so lookups with lowercase input can skip lower()
+        key = sys.intern(handler.extension.lower())
+        handler.extension = key
+        self._handlers[key] = handler
+        self._dirty = True
+
+    def _rebuild(self) -> None:
+        """Rebuild the per-type extension lookups after registrations."""
+        # Rebuilt from the handler map so re-registered extensions (.bin, .iso) appear once
+        by_type: dict[FileHandlingType, list[str]] = {t: [] for t in FileHandlingType}
+        for ext, handler in self._handlers.items():
+            by_type[handler.handling_type].append(ext)
+        self._by_type = {t: tuple(exts) for t, exts in by_type.items()}
+        self._extensions_by_type = {t: frozenset(exts) for t, exts in by_type.items()}
+        self._all_extensions = tuple(self._handlers)
+        self._dirty = False
+
+    def _get_extensions(self, handling_type: FileHandlingType) -> frozenset[str]:
+        """Get the registered extensions for a handling type."""
+        if self._dirty:
+            self._rebuild()
+        return self._extensions_by_type[handling_type]
+
+    def _get_extension_tuple(self, handling_type: FileHandlingType) -> tuple[str, ...]:
+        """Get the registered extensions for a handling type in registration order."""
+        if self._dirty:
+            self._rebuild()
+        return self._by_type[handling_type]
 
     def register_platform_extensions(self, platform) -> None:
         """Register extensions for a platform instance."""
@@ -58,9 +96,13 @@ class ExtensionHandlerRegistry:
         """Get handler for an extension."""
         return self._handlers.get(extension.lower())
 
+    def get_handler_lower(self, ext_lower: str) -> ExtensionHandler | None:
+        """Get handler for an extension that is already lowercase."""
+        return self._get_handler_fast(ext_lower)
+
     def get_handler_for_file(self, file_path: Path) -> ExtensionHandler | None:
         """Get handler for a file path."""
-        return self.get_handler(file_path.suffix)
+        return self._get_handler_fast(file_path.suffix.lower())
 
     def is_supported_extension(self, extension: str) -> bool:
         """Check if an extension is supported."""
@@ -68,42 +110,33 @@ class ExtensionHandlerRegistry:
 
     def is_archive_extension(self, extension: str) -> bool:
         """Check if an extension is an archive format."""
-        handler = self.get_handler(extension)
-        return handler is not None and handler.handling_type == FileHandlingType.ARCHIVE
+        return extension.lower() in self._get_extensions(FileHandlingType.ARCHIVE)
 
     def is_direct_extension(self, extension: str) -> bool:
         """Check if an extension is a direct format."""
-        handler = self.get_handler(extension)
-        return handler is not None and handler.handling_type == FileHandlingType.DIRECT
+        return extension.lower() in self._get_extensions(FileHandlingType.DIRECT)
 
     def is_multi_file_extension(self, extension: str) -> bool:
         """Check if an extension is a multi-file format."""
-        handler = self.get_handler(extension)
-        return handler is not None and handler.handling_type == FileHandlingType.MULTI_FILE
+        return extension.lower() in self._get_extensions(FileHandlingType.MULTI_FILE)
 
-    def get_archive_extensions(self) -> list[str]:
+    def get_archive_extensions(self) -> tuple[str, ...]:
         """Get all archive extensions."""
-        return [
-            ext
-            for ext, handler in self._handlers.items()
-            if handler.handling_type == FileHandlingType.ARCHIVE
-        ]
+        return self._get_extension_tuple(FileHandlingType.ARCHIVE)
 
-    def get_direct_extensions(self) -> list[str]:
+    def get_direct_extensions(self) -> tuple[str, ...]:
         """Get all direct extensions."""
-        return [
-            ext
-            for ext, handler in self._handlers.items()
-            if handler.handling_type == FileHandlingType.DIRECT
-        ]
+        return self._get_extension_tuple(FileHandlingType.DIRECT)
 
-    def get_multi_file_extensions(self) -> list[str]:
+    def get_multi_file_extensions(self) -> tuple[str, ...]:
         """Get all multi-file extensions."""
-        return [
-            ext
-            for ext, handler in self._handlers.items()
-            if handler.handling_type == FileHandlingType.MULTI_FILE
-        ]
+        return self._get_extension_tuple(FileHandlingType.MULTI_FILE)
+
+    def get_all_supported_extensions(self) -> tuple[str, ...]:
+        """Get all registered extensions."""
+        if self._dirty:
+            self._rebuild()
+        return self._all_extensions
 
 
 # Global registry instance
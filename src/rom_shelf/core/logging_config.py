@@ -1,11 +1,17 @@
 """Centralized logging configuration for RomShelf."""
 
+import atexit
+import functools
 import logging
-import logging.handlers
 import os
 import sys
+import time
 from enum import Enum
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from logging.handlers import QueueListener
 
 
 class Environment(Enum):
@@ -17,6 +23,51 @@ class Environment(Enum):
     DEBUG = "debug"
 
 
+@functools.lru_cache(maxsize=1)
+def detect_environment() -> Environment:
+    """Detect the current environment from environment variables or defaults.
+
+    Unlike get_environment(), this doesn't set up logging, so other modules can
+    call it while they are being configured.
+
+    Returns:
+        The detected environment.
+    """
+    env_var = os.environ.get("ROMSHELF_ENV", "").lower()
+
+    if env_var == "test" or "pytest" in sys.modules:
+        return Environment.TEST
+    elif env_var == "debug" or os.environ.get("ROMSHELF_DEBUG", "").lower() == "true":
+        return Environment.DEBUG
+    elif env_var == "production":
+        return Environment.PRODUCTION
+    else:
+        # Default to development
+        return Environment.DEVELOPMENT
+
+
+@functools.lru_cache(maxsize=1)
+def _default_log_dir() -> Path:
+    """Get the default log directory based on the operating system, creating it once.
+
+    Returns:
+        Path to the log directory.
+    """
+    if sys.platform == "win32":
+        # Windows: %LOCALAPPDATA%\RomShelf\logs
+        base = Path(os.environ.get("LOCALAPPDATA", Path.home() / "AppData" / "Local"))
+    elif sys.platform == "darwin":
+        # macOS: ~/Library/Logs/RomShelf
+        base = Path.home() / "Library" / "Logs"
+    else:
+        # Linux: ~/.local/share/RomShelf/logs
+        base = Path.home() / ".local" / "share"
+
+    log_dir = base / "RomShelf" / "logs"
+    log_dir.mkdir(parents=True, exist_ok=True)
+    return log_dir
+
+
 class LoggingConfig:
     """Manages application-wide logging configuration."""
 
@@ -29,72 +80,50 @@ class LoggingConfig:
         Args:
             log_dir: Directory for log files. If None, uses default location.
         """
-        self.environment = self._detect_environment()
-        self.log_dir = log_dir or self._get_default_log_dir()
-        self.log_dir.mkdir(parents=True, exist_ok=True)
+        self.environment = detect_environment()
+        if log_dir is None:
+            self.log_dir = _default_log_dir()
+        else:
+            self.log_dir = log_dir
+            self.log_dir.mkdir(parents=True, exist_ok=True)
 
         # Store original stderr for critical errors
         self._original_stderr = sys.stderr
 
-    def _detect_environment(self) -> Environment:
-        """Detect the current environment from environment variables or defaults.
-
-        Returns:
-            The detected environment.
-        """
-        env_var = os.environ.get("ROMSHELF_ENV", "").lower()
-
-        if env_var == "test" or "pytest" in sys.modules:
-            return Environment.TEST
-        elif env_var == "debug" or os.environ.get("ROMSHELF_DEBUG", "").lower() == "true":
-            return Environment.DEBUG
-        elif env_var == "production":
-            return Environment.PRODUCTION
-        else:
-            # Default to development
-            return Environment.DEVELOPMENT
-
-    def _get_default_log_dir(self) -> Path:
-        """Get the default log directory based on the operating system.
-
-        Returns:
-            Path to the log directory.
-        """
-        if sys.platform == "win32":
-            # Windows: %LOCALAPPDATA%\RomShelf\logs
-            base = Path(os.environ.get("LOCALAPPDATA", Path.home() / "AppData" / "Local"))
-        elif sys.platform == "darwin":
-            # macOS: ~/Library/Logs/RomShelf
-            base = Path.home() / "Library" / "Logs"
-        else:
-            # Linux: ~/.local/share/RomShelf/logs
-            base = Path.home() / ".local" / "share"
+        # Formatters are shared by all handlers instead of being rebuilt per handler
+        self._default_fmt = logging.Formatter(self.DEFAULT_FORMAT)
+        self._detailed_fmt = logging.Formatter(self.DETAILED_FORMAT)
 
-        return base / "RomShelf" / "logs"
+        # Background listener that performs the file writes
+        self._listener: QueueListener | None = None
 
     def setup_logging(self) -> None:
         """Configure logging for the entire application."""
         # Clear any existing handlers
+        self.shutdown()
         root = logging.getLogger()
         root.handlers = []
 
         # Set base level based on environment
         if self.environment == Environment.DEBUG:
             root.setLevel(logging.DEBUG)
-            log_format = self.DETAILED_FORMAT
+            formatter = self._detailed_fmt
         elif self.environment == Environment.TEST:
             root.setLevel(logging.WARNING)
-            log_format = self.DEFAULT_FORMAT
+            formatter = self._default_fmt
         elif self.environment == Environment.PRODUCTION:
             root.setLevel(logging.INFO)
-            log_format = self.DEFAULT_FORMAT
+            formatter = self._default_fmt
+            # Thread and process names are not part of any format
+            logging.logThreads = False
+            logging.logProcesses = False
         else:  # DEVELOPMENT
             root.setLevel(logging.DEBUG)
-            log_format = self.DETAILED_FORMAT
+            formatter = self._detailed_fmt
 
         # Console handler (always present)
         console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setFormatter(logging.Formatter(log_format))
+        console_handler.setFormatter(formatter)
 
         # Adjust console output based on environment
         if self.environment == Environment.PRODUCTION:
@@ -108,36 +137,54 @@ class LoggingConfig:
 
         # File handlers (not in test environment)
         if self.environment != Environment.TEST:
+            # Deferred so code paths that never configure file logging skip the import
+            import queue
+            from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
             # Main log file with rotation
             main_log_file = self.log_dir / "romshelf.log"
-            file_handler = logging.handlers.RotatingFileHandler(
+            file_handler = RotatingFileHandler(
                 main_log_file,
                 maxBytes=10 * 1024 * 1024,  # 10MB
                 backupCount=5,
                 encoding="utf-8",
             )
-            file_handler.setFormatter(logging.Formatter(self.DETAILED_FORMAT))
+            file_handler.setFormatter(self._detailed_fmt)
             file_handler.setLevel(logging.DEBUG)
-            root.addHandler(file_handler)
 
             # Error log file
             error_log_file = self.log_dir / "errors.log"
-            error_handler = logging.handlers.RotatingFileHandler(
+            error_handler = RotatingFileHandler(
                 error_log_file,
                 maxBytes=5 * 1024 * 1024,  # 5MB
                 backupCount=3,
                 encoding="utf-8",
             )
-            error_handler.setFormatter(logging.Formatter(self.DETAILED_FORMAT))
+            error_handler.setFormatter(self._detailed_fmt)
             error_handler.setLevel(logging.ERROR)
-            root.addHandler(error_handler)
+
+            # Worker threads only enqueue records; the listener thread does the file I/O
+            log_queue: queue.SimpleQueue = queue.SimpleQueue()
+            self._listener = QueueListener(
+                log_queue, file_handler, error_handler, respect_handler_level=True
+            )
+            self._listener.start()
+            root.addHandler(QueueHandler(log_queue))
 
         # Log initial configuration
         logger = logging.getLogger(__name__)
-        logger.info(f"Logging configured for environment: {self.environment.value}")
-        logger.info(f"Log directory: {self.log_dir}")
-        logger.debug(f"Python version: {sys.version}")
-        logger.debug(f"Platform: {sys.platform}")
+        logger.info("Logging configured for environment: %s", self.environment.value)
+        logger.info("Log directory: %s", self.log_dir)
+        logger.debug("Python version: %s", sys.version)
+        logger.debug("Platform: %s", sys.platform)
+
+    def shutdown(self) -> None:
+        """Stop the background log listener, flushing queued records to the log files."""
+        if self._listener is not None:
+            self._listener.stop()
+            for handler in self._listener.handlers:
+                handler.close()
+            self._listener = None
 
     def get_logger(self, name: str) -> logging.Logger:
         """Get a logger instance with the given name.
@@ -168,16 +215,15 @@ class LoggingConfig:
 
         try:
             # Keep only the last 30 days of logs
-            import time
-
-            current_time = time.time()
-            for log_file in self.log_dir.glob("*.log*"):
-                if log_file.stat().st_mtime < current_time - (30 * 24 * 60 * 60):
-                    log_file.unlink()
+            cutoff = time.time() - (30 * 24 * 60 * 60)
+            with os.scandir(self.log_dir) as it:
+                for entry in it:
+                    if ".log" in entry.name and entry.stat().st_mtime < cutoff:
+                        os.unlink(entry.path)
         except Exception as e:
             # Don't fail if cleanup fails
             logger = logging.getLogger(__name__)
-            logger.warning(f"Failed to clean up old logs: {e}")
+            logger.warning("Failed to clean up old logs: %s", e)
 
 
 # Global instance
@@ -197,6 +243,7 @@ def setup_logging(log_dir: Path | None = None) -> LoggingConfig:
     if _config is None:
         _config = LoggingConfig(log_dir)
         _config.setup_logging()
+        atexit.register(_config.shutdown)
         _config.configure_external_libraries()
         _config.cleanup()
     return _config
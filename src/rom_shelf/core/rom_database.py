@@ -1,24 +1,86 @@
 """Improved ROM database with better concurrency and deadlock prevention."""
 
-import hashlib
-import json
+import functools
 import logging
+import os
 import sqlite3
 import threading
 import time
-import zlib
+import weakref
+from collections import OrderedDict
 from collections.abc import Iterator
 from contextlib import contextmanager
-from dataclasses import asdict, dataclass
+from dataclasses import dataclass, replace
 from enum import Enum
 from pathlib import Path
-from queue import Queue
 from typing import Any
 
 from ..utils.name_cleaner import extract_rom_metadata
+from .rom_hasher import ROMHasher
+
+# Marks a fingerprint cache lookup that found nothing, as opposed to a cached None
+_CACHE_MISS = object()
 
 # Database schema version
-DATABASE_VERSION = 5
+DATABASE_VERSION = 9
+
+INSERT_FINGERPRINT_SQL = """
+    INSERT OR REPLACE INTO rom_fingerprints (
+        file_key, file_path, file_size, modified_time,
+        md5_hash, header_hash, crc32,
+        archive_path, internal_path, archive_modified_time,
+        platform, region, revision,
+        ra_game_id, ra_hash, ra_title, ra_last_check,
+        created_time, last_verified_time, verification_count
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+# Columns read back into a ROMFingerprint, in ROMFingerprint field order
+FINGERPRINT_COLUMNS = (
+    "file_path, file_size, modified_time, md5_hash, header_hash, crc32, "
+    "archive_path, internal_path, archive_modified_time, platform, region, revision, "
+    "ra_game_id, ra_hash, ra_title, ra_last_check, "
+    "created_time, last_verified_time, verification_count"
+)
+FINGERPRINT_FIELDS = frozenset(FINGERPRINT_COLUMNS.split(", "))
+SELECT_FINGERPRINT_SQL = f"SELECT {FINGERPRINT_COLUMNS} FROM rom_fingerprints WHERE file_key = ?"
+FIND_BY_MD5_SQL = f"SELECT {FINGERPRINT_COLUMNS} FROM rom_fingerprints WHERE md5_hash = ?"
+HAS_MISSING_MD5_SQL = (
+    "SELECT 1 FROM rom_fingerprints WHERE md5_hash IS NULL OR md5_hash = '' LIMIT 1"
+)
+FIND_BY_PLATFORM_SQL = f"SELECT {FINGERPRINT_COLUMNS} FROM rom_fingerprints WHERE platform = ?"
+BULK_KEYS_CREATE_SQL = "CREATE TEMP TABLE IF NOT EXISTS bulk_keys (file_key TEXT PRIMARY KEY)"
+BULK_KEYS_INSERT_SQL = "INSERT OR IGNORE INTO temp.bulk_keys (file_key) VALUES (?)"
+BULK_KEYS_SELECT_SQL = (
+    f"SELECT f.file_key, {FINGERPRINT_COLUMNS} FROM rom_fingerprints f "
+    "JOIN temp.bulk_keys k ON k.file_key = f.file_key"
+)
+SELECT_ALL_SQL = f"SELECT file_key, {FINGERPRINT_COLUMNS} FROM rom_fingerprints"
+# Formatted with the columns the attached source database actually has
+IMPORT_FINGERPRINTS_SQL = (
+    "INSERT OR IGNORE INTO main.rom_fingerprints ({columns}) "
+    "SELECT {columns} FROM source.rom_fingerprints"
+)
+DELETE_FINGERPRINT_SQL = "DELETE FROM rom_fingerprints WHERE file_key = ?"
+COUNT_SQL = "SELECT COUNT(*) FROM rom_fingerprints"
+COUNT_BY_PLATFORM_SQL = "SELECT platform, COUNT(*) FROM rom_fingerprints GROUP BY platform"
+SELECT_DIRECTORY_SQL = (
+    "SELECT files, subdirectories FROM directory_cache WHERE directory = ? AND mtime_ns = ?"
+)
+UPSERT_DIRECTORY_SQL = (
+    "INSERT OR REPLACE INTO directory_cache (directory, mtime_ns, files, subdirectories) "
+    "VALUES (?, ?, ?, ?)"
+)
+# Cached directories at or below a root; substr avoids LIKE treating _ and % as wildcards
+SELECT_DIRECTORIES_UNDER_SQL = (
+    "SELECT directory FROM directory_cache WHERE directory = ? OR substr(directory, 1, ?) = ?"
+)
+DELETE_DIRECTORY_SQL = "DELETE FROM directory_cache WHERE directory = ?"
+CLEAR_DIRECTORY_CACHE_SQL = "DELETE FROM directory_cache"
+# Separates names in a cached listing; file names can never contain NUL
+LISTING_SEPARATOR = "\0"
+
+# Statements kept prepared per connection; covers every constant above with headroom
+CACHED_STATEMENTS = 128
 
 
 class FingerprintStatus(Enum):
@@ -30,7 +92,7 @@ class FingerprintStatus(Enum):
     CORRUPTED = "corrupted"
 
 
-@dataclass
+@dataclass(slots=True)
 class ROMFingerprint:
     """Comprehensive fingerprint for ROM file integrity verification."""
 
@@ -42,7 +104,7 @@ class ROMFingerprint:
     # Content verification
     md5_hash: str | None = None
     header_hash: str = ""  # Hash of first 1KB for quick verification
-    crc32: int = 0
+    crc32: int | None = None  # None when hashing failed; 0 is a valid CRC
 
     # Archive-specific data
     archive_path: str | None = None
@@ -65,6 +127,34 @@ class ROMFingerprint:
     last_verified_time: float = 0.0
     verification_count: int = 0
 
+    @property
+    def crc32_hex(self) -> str:
+        """CRC32 in the 8-digit hex form used by DAT files, or "" when not computed."""
+        return f"{self.crc32:08X}" if self.crc32 is not None else ""
+
+
+class _ThreadConnection:
+    """Holder for a thread's connection, closed when the thread's local storage is released."""
+
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        """Initialize the holder around an open connection."""
+        self.conn = conn
+        self.pid = os.getpid()
+
+    def close(self) -> None:
+        """Close the wrapped connection."""
+        if self.pid != os.getpid():
+            # A forked child must leave the parent's SQLite handle alone
+            return
+        try:
+            self.conn.close()
+        except sqlite3.Error:
+            pass
+
+    def __del__(self) -> None:
+        """Close the connection once its thread is gone."""
+        self.close()
+
 
 class DatabaseConnectionPool:
     """SQLite connection pool for better concurrency."""
@@ -87,11 +177,16 @@ class DatabaseConnectionPool:
         self.max_connections = max_connections
         self.timeout = timeout
 
-        # Connection pool
-        self._connections: Queue = Queue(maxsize=max_connections)
-        self._connection_count = 0
+        # One read-only connection per thread, reused for every read on that thread
+        self._tls = threading.local()
+        self._holders: weakref.WeakSet[_ThreadConnection] = weakref.WeakSet()
         self._lock = threading.Lock()
 
+        # Single serialized writer; WAL lets readers keep a consistent snapshot meanwhile
+        self._write_conn: sqlite3.Connection | None = None
+        self._write_pid = 0
+        self._write_lock = threading.RLock()
+
         # Initialize database
         self._initialize_database()
 
@@ -105,9 +200,7 @@ class DatabaseConnectionPool:
         try:
             # Enable WAL mode for better concurrency
             conn.execute("PRAGMA journal_mode=WAL")
-            conn.execute("PRAGMA synchronous=NORMAL")
-            conn.execute("PRAGMA cache_size=10000")
-            conn.execute("PRAGMA temp_store=MEMORY")
+            self._configure(conn)
 
             # Create metadata table
             conn.execute(
@@ -145,8 +238,7 @@ class DatabaseConnectionPool:
                         revision TEXT,
                         created_time REAL,
                         last_verified_time REAL,
-                        verification_count INTEGER,
-                        data_json TEXT
+                        verification_count INTEGER
                     )
                     """
                 )
@@ -177,9 +269,50 @@ class DatabaseConnectionPool:
                     )
                     self.logger.info("Added ra_last_check column")
 
+            if current_version < 6:
+                # Fingerprints are stored in typed columns only; drop the JSON copy
+                cursor = conn.execute("PRAGMA table_info(rom_fingerprints)")
+                columns = [col[1] for col in cursor.fetchall()]
+                if "data_json" in columns and sqlite3.sqlite_version_info >= (3, 35, 0):
+                    conn.execute("ALTER TABLE rom_fingerprints DROP COLUMN data_json")
+                    self.logger.info("Dropped data_json column")
+
+            if current_version < 8:
+                # One directory level per row, valid while the directory's mtime is unchanged
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS directory_cache (
+                        directory TEXT PRIMARY KEY,
+                        mtime_ns INTEGER NOT NULL,
+                        files TEXT NOT NULL,
+                        subdirectories TEXT NOT NULL
+                    ) WITHOUT ROWID
+                    """
+                )
+                self.logger.info("Created directory_cache table")
+
+            if current_version < 9:
+                # 0 used to mark a failed hash; it is a valid CRC, so failures are now NULL.
+                # Rows with an MD5 were hashed in the same pass, so their 0 is genuine.
+                conn.execute(
+                    "UPDATE rom_fingerprints SET crc32 = NULL "
+                    "WHERE crc32 = 0 AND (md5_hash IS NULL OR md5_hash = '')"
+                )
+                conn.execute("DROP INDEX IF EXISTS idx_nonzero_crc")
+
             # Create indexes for common queries
             conn.execute("CREATE INDEX IF NOT EXISTS idx_platform ON rom_fingerprints(platform)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_md5 ON rom_fingerprints(md5_hash)")
+            # Duplicate detection per platform walks this index without touching the table
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_platform_md5 ON rom_fingerprints(platform, md5_hash)"
+            )
+            # Partial index for CRC lookups; unhashed rows store NULL and are left out, so
+            # queries must repeat "crc32 IS NOT NULL" for the planner to pick it
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_crc32 ON rom_fingerprints(crc32) "
+                "WHERE crc32 IS NOT NULL"
+            )
             conn.execute("CREATE INDEX IF NOT EXISTS idx_file_path ON rom_fingerprints(file_path)")
 
             # Only create RA index if column exists
@@ -204,69 +337,126 @@ class DatabaseConnectionPool:
         finally:
             conn.close()
 
+    def _configure(self, conn: sqlite3.Connection) -> None:
+        """Apply the connection-scoped PRAGMAs used for every connection.
+
+        Args:
+            conn: Newly opened connection.
+        """
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA cache_size=-65536")  # 64MB page cache
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=10737418240")  # Map up to 10GB for reads
+        conn.execute("PRAGMA wal_autocheckpoint=1000")
+        # Shrink the WAL back to this size after checkpoints instead of keeping its peak
+        conn.execute("PRAGMA journal_size_limit=67108864")
+
     @contextmanager
     def get_connection(self) -> Iterator[sqlite3.Connection]:
-        """Get a connection from the pool.
+        """Get the calling thread's read-only connection, opening it on first use.
+
+        Connections are not probed on checkout. One is only replaced after a fork or
+        after an operation on it raised.
 
         Yields:
-            SQLite connection.
+            Read-only SQLite connection.
         """
-        conn = None
+        holder = getattr(self._tls, "holder", None)
+        if holder is not None and holder.pid != os.getpid():
+            holder = None
+        if holder is None:
+            conn = sqlite3.connect(
+                self.db_path.resolve().as_uri() + "?mode=ro",
+                timeout=self.timeout,
+                check_same_thread=False,
+                cached_statements=CACHED_STATEMENTS,
+                uri=True,
+            )
+            self._configure(conn)
+            holder = _ThreadConnection(conn)
+            self._tls.holder = holder
+            with self._lock:
+                self._holders.add(holder)
+            self.logger.debug(f"Created connection for thread {threading.current_thread().name}")
+
         try:
-            # Try to get existing connection from pool
-            try:
-                conn = self._connections.get(block=False)
-            except:
-                conn = None
-
-            # Create new connection if needed
-            if conn is None:
-                with self._lock:
-                    if self._connection_count < self.max_connections:
-                        conn = sqlite3.connect(
-                            str(self.db_path),
-                            timeout=self.timeout,
-                            check_same_thread=False,
-                        )
-                        conn.row_factory = sqlite3.Row
-                        self._connection_count += 1
-                        self.logger.debug(
-                            f"Created new connection (total: {self._connection_count})"
-                        )
-                    else:
-                        # Wait for available connection
-                        conn = self._connections.get(block=True, timeout=self.timeout)
+            yield holder.conn
+        except sqlite3.Error:
+            self._discard(holder)
+            raise
 
-            # Ensure connection is healthy
-            try:
-                conn.execute("SELECT 1")
-            except sqlite3.Error:
-                # Connection is broken, create new one
-                conn.close()
+    def _discard(self, holder: _ThreadConnection) -> None:
+        """Close a thread's connection so the next checkout opens a fresh one.
+
+        Args:
+            holder: Holder of the connection to drop.
+        """
+        with self._lock:
+            self._holders.discard(holder)
+        if getattr(self._tls, "holder", None) is holder:
+            self._tls.holder = None
+        holder.close()
+
+    @contextmanager
+    def get_write_connection(self) -> Iterator[sqlite3.Connection]:
+        """Get the shared writer connection, held exclusively for the block.
+
+        Yields:
+            Writable SQLite connection.
+        """
+        with self._write_lock:
+            if self._write_conn is not None and self._write_pid != os.getpid():
+                # Inherited across a fork; abandon it without closing the parent's handle
+                self._write_conn = None
+            if self._write_conn is None:
+                # URI mode lets ATTACH open other databases read-only
                 conn = sqlite3.connect(
-                    str(self.db_path),
+                    self.db_path.resolve().as_uri(),
                     timeout=self.timeout,
                     check_same_thread=False,
+                    cached_statements=CACHED_STATEMENTS,
+                    uri=True,
                 )
-                conn.row_factory = sqlite3.Row
+                self._configure(conn)
+                self._write_conn = conn
+                self._write_pid = os.getpid()
+            try:
+                yield self._write_conn
+            except sqlite3.Error:
+                self._write_conn.close()
+                self._write_conn = None
+                raise
 
-            yield conn
+    def close(self) -> None:
+        """Close every connection opened by the pool."""
+        with self._lock:
+            holders = list(self._holders)
+            self._holders.clear()
+            # Dropping the thread-local makes threads reconnect on their next use
+            self._tls = threading.local()
 
-        finally:
-            # Return connection to pool
-            if conn:
-                try:
-                    self._connections.put(conn, block=False)
-                except:
-                    # Pool is full, close connection
-                    conn.close()
-                    with self._lock:
-                        self._connection_count -= 1
+        for holder in holders:
+            holder.close()
+
+        with self._write_lock:
+            if self._write_conn is not None:
+                if self._write_pid == os.getpid():
+                    self._write_conn.close()
+                self._write_conn = None
 
 
 class ROMDatabase:
     """Improved ROM database with SQLite backend and connection pooling."""
 
+    # Rows per executemany call in batch inserts
+    BATCH_SIZE = 500
+    # Largest key list looked up with an IN (...) list; larger lists join a temp table
+    BULK_IN_LIMIT = 500
+    # Fingerprints (and misses) remembered between writes for repeated lookups
+    FINGERPRINT_CACHE_SIZE = 4096
+    # Checkpoint and truncate the WAL once it outgrows this fraction of the database
+    WAL_COMPACT_RATIO = 0.25
+
     def __init__(
         self,
         db_path: Path,
@@ -292,10 +482,30 @@ class ROMDatabase:
         self._operation_counter = 0
         self._last_vacuum_time = time.time()
         self._vacuum_interval = 7 * 24 * 60 * 60  # 7 days
+        self._last_optimize_time = time.time()
+        self._optimize_interval = 15 * 60  # 15 minutes
 
         # Auto vacuum configuration
         self.auto_vacuum = auto_vacuum
 
+        # Row counts from get_statistics, reused until the next write
+        self._write_generation = 0
+        self._stats_cache: tuple[int, int, dict[str, int]] | None = None
+
+        # Recently read fingerprints, dropped whenever the write generation moves on
+        self._fp_cache: OrderedDict[str, ROMFingerprint | None] = OrderedDict()
+        self._fp_cache_generation = 0
+        self._fp_cache_lock = threading.Lock()
+
+        # Hashes files and archive members, keeping archive handles open between ROMs
+        self._hasher = ROMHasher()
+
+        # Write-behind queue drained by a background thread in batches
+        self._pending: list[tuple[str, ROMFingerprint]] = []
+        self._pending_cond = threading.Condition()
+        self._writing = False
+        self._writer_thread: threading.Thread | None = None
+
     def add_fingerprint(self, fingerprint: ROMFingerprint) -> bool:
         """Add or update ROM fingerprint in database.
 
@@ -305,17 +515,26 @@ class ROMDatabase:
         Returns:
             True if successful.
         """
-        file_key = self._generate_file_key(
-            Path(fingerprint.file_path),
-            fingerprint.internal_path,
-        )
+        file_key = self._generate_file_key(fingerprint.file_path, fingerprint.internal_path)
+        return self.add_fingerprint_with_key(file_key, fingerprint)
 
+    def add_fingerprint_with_key(self, file_key: str, fingerprint: ROMFingerprint) -> bool:
+        """Add or update ROM fingerprint under an already generated file key.
+
+        Args:
+            file_key: Unique file key for the fingerprint.
+            fingerprint: ROM fingerprint to store.
+
+        Returns:
+            True if successful.
+        """
         try:
-            with self.pool.get_connection() as conn:
+            with self.pool.get_write_connection() as conn:
                 self._save_fingerprint(conn, file_key, fingerprint)
                 conn.commit()
 
                 self._operation_counter += 1
+                self._write_generation += 1
                 self._check_vacuum()
 
                 return True
@@ -324,6 +543,52 @@ class ROMDatabase:
             self.logger.error(f"Failed to add fingerprint: {e}")
             return False
 
+    def add_fingerprint_deferred(self, file_key: str, fingerprint: ROMFingerprint) -> None:
+        """Queue a fingerprint for the background writer instead of writing it now.
+
+        Queued fingerprints are committed in batches; call flush() before relying on
+        them being readable.
+
+        Args:
+            file_key: Unique file key for the fingerprint.
+            fingerprint: ROM fingerprint to store.
+        """
+        with self._pending_cond:
+            self._pending.append((file_key, fingerprint))
+            if self._writer_thread is None:
+                self._writer_thread = threading.Thread(
+                    target=self._writer_loop, name="ROMDatabaseWriter", daemon=True
+                )
+                self._writer_thread.start()
+            self._pending_cond.notify_all()
+
+    def flush(self) -> None:
+        """Block until every queued fingerprint has been committed."""
+        with self._pending_cond:
+            while self._pending or self._writing:
+                self._pending_cond.wait()
+
+    def _writer_loop(self) -> None:
+        """Commit queued fingerprints, batching whatever piled up during the last write."""
+        while True:
+            with self._pending_cond:
+                while not self._pending:
+                    self._pending_cond.wait()
+                batch = self._pending
+                self._pending = []
+                self._writing = True
+
+            try:
+                self.batch_add_fingerprints(
+                    [fingerprint for _, fingerprint in batch], [key for key, _ in batch]
+                )
+            except Exception as e:
+                self.logger.error(f"Background fingerprint write failed: {e}")
+            finally:
+                with self._pending_cond:
+                    self._writing = False
+                    self._pending_cond.notify_all()
+
     def get_fingerprint(
         self,
         file_path: Path,
@@ -338,25 +603,94 @@ class ROMDatabase:
         Returns:
             ROM fingerprint if found.
         """
-        file_key = self._generate_file_key(file_path, internal_path)
+        return self.get_fingerprint_by_key(self._generate_file_key(str(file_path), internal_path))
 
-        try:
-            with self.pool.get_connection() as conn:
-                cursor = conn.execute(
-                    "SELECT * FROM rom_fingerprints WHERE file_key = ?",
-                    (file_key,),
-                )
-                row = cursor.fetchone()
+    def get_fingerprint_by_key(self, file_key: str) -> ROMFingerprint | None:
+        """Get ROM fingerprint by a key already generated with get_file_key.
 
-                if row:
-                    return self._row_to_fingerprint(row)
+        Args:
+            file_key: Unique file key.
+
+        Returns:
+            ROM fingerprint if found.
+        """
+        with self._fp_cache_lock:
+            generation = self._write_generation
+            if self._fp_cache_generation != generation:
+                self._fp_cache.clear()
+                self._fp_cache_generation = generation
+            else:
+                cached = self._fp_cache.get(file_key, _CACHE_MISS)
+                if cached is not _CACHE_MISS:
+                    self._fp_cache.move_to_end(file_key)
+                    return cached
 
-                return None
+        try:
+            with self.pool.get_connection() as conn:
+                row = conn.execute(SELECT_FINGERPRINT_SQL, (file_key,)).fetchone()
+                fingerprint = self._row_to_fingerprint(row) if row else None
 
         except sqlite3.Error as e:
             self.logger.error(f"Failed to get fingerprint: {e}")
             return None
 
+        with self._fp_cache_lock:
+            # Only cache what was read if no write landed in the meantime
+            if generation == self._write_generation == self._fp_cache_generation:
+                self._fp_cache[file_key] = fingerprint
+                if len(self._fp_cache) > self.FINGERPRINT_CACHE_SIZE:
+                    self._fp_cache.popitem(last=False)
+        return fingerprint
+
+    def get_fingerprints_bulk(self, file_keys: list[str]) -> dict[str, ROMFingerprint]:
+        """Get stored fingerprints for many file keys with a single query.
+
+        Args:
+            file_keys: File keys as returned by get_file_key.
+
+        Returns:
+            Mapping of file key to fingerprint for the keys found in the database.
+        """
+        if not file_keys:
+            return {}
+
+        try:
+            with self.pool.get_connection() as conn:
+                if len(file_keys) <= self.BULK_IN_LIMIT:
+                    placeholders = ",".join("?" * len(file_keys))
+                    cursor = conn.execute(
+                        f"SELECT file_key, {FINGERPRINT_COLUMNS} FROM rom_fingerprints "
+                        f"WHERE file_key IN ({placeholders})",
+                        file_keys,
+                    )
+                    return {row[0]: ROMFingerprint(*row[1:]) for row in cursor}
+
+                # Too many keys for one IN list; join against a temp table instead
+                conn.execute(BULK_KEYS_CREATE_SQL)
+                try:
+                    conn.executemany(BULK_KEYS_INSERT_SQL, ((key,) for key in file_keys))
+                    cursor = conn.execute(BULK_KEYS_SELECT_SQL)
+                    return {row[0]: ROMFingerprint(*row[1:]) for row in cursor}
+                finally:
+                    conn.execute("DELETE FROM temp.bulk_keys")
+                    conn.commit()
+
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to get fingerprints in bulk: {e}")
+            return {}
+
+    def get_file_key(self, file_path: Path | str, internal_path: str | None = None) -> str:
+        """Get the database key for a ROM file or archive member.
+
+        Args:
+            file_path: Path to ROM file or archive.
+            internal_path: Path within archive if applicable.
+
+        Returns:
+            Unique string key.
+        """
+        return self._generate_file_key(str(file_path), internal_path)
+
     def find_by_hash(self, md5_hash: str) -> list[ROMFingerprint]:
         """Find all ROMs with matching MD5 hash.
 
@@ -368,11 +702,15 @@ class ROMDatabase:
         """
         try:
             with self.pool.get_connection() as conn:
-                cursor = conn.execute(
-                    "SELECT * FROM rom_fingerprints WHERE md5_hash = ?",
-                    (md5_hash,),
-                )
-                return [self._row_to_fingerprint(row) for row in cursor.fetchall()]
+                cursor = conn.execute(FIND_BY_MD5_SQL, (md5_hash,))
+                # Build fingerprints straight off the cursor instead of materializing all rows
+                matches = [ROMFingerprint(*row) for row in cursor]
+                if not matches and conn.execute(HAS_MISSING_MD5_SQL).fetchone():
+                    self.logger.warning(
+                        "Some fingerprints were created without an MD5 hash "
+                        "and can't be found by hash searches"
+                    )
+                return matches
 
         except sqlite3.Error as e:
             self.logger.error(f"Failed to search by hash: {e}")
@@ -389,21 +727,22 @@ class ROMDatabase:
         """
         try:
             with self.pool.get_connection() as conn:
-                cursor = conn.execute(
-                    "SELECT * FROM rom_fingerprints WHERE platform = ?",
-                    (platform,),
-                )
-                return [self._row_to_fingerprint(row) for row in cursor.fetchall()]
+                cursor = conn.execute(FIND_BY_PLATFORM_SQL, (platform,))
+                # Build fingerprints straight off the cursor instead of materializing all rows
+                return [ROMFingerprint(*row) for row in cursor]
 
         except sqlite3.Error as e:
             self.logger.error(f"Failed to search by platform: {e}")
             return []
 
-    def verify_fingerprint(self, file_path_or_fingerprint) -> FingerprintStatus:
+    def verify_fingerprint(
+        self, file_path_or_fingerprint, file_stat: os.stat_result | None = None
+    ) -> FingerprintStatus:
         """Verify if a ROM file matches its stored fingerprint.
 
         Args:
             file_path_or_fingerprint: Path to ROM file OR ROMFingerprint object.
+            file_stat: Current stat of the file if the caller already has one.
 
         Returns:
             Verification status.
@@ -426,23 +765,38 @@ class ROMDatabase:
         if not stored:
             return FingerprintStatus.MISSING
 
-        if not file_path.exists():
-            return FingerprintStatus.MISSING
-
         try:
+            # A single stat answers existence, size and modification time
+            if file_stat is None:
+                try:
+                    file_stat = file_path.stat()
+                except (FileNotFoundError, NotADirectoryError):
+                    return FingerprintStatus.MISSING
+
             # Quick check: file size
-            current_size = file_path.stat().st_size
-            if current_size != stored.file_size:
+            if file_stat.st_size != stored.file_size:
                 return FingerprintStatus.CHANGED
 
             # Quick check: modification time
-            current_mtime = file_path.stat().st_mtime
-            if abs(current_mtime - stored.modified_time) > 1:  # Allow 1 second tolerance
+            if abs(file_stat.st_mtime - stored.modified_time) > 1:  # Allow 1 second tolerance
                 # File was modified, check header hash
-                current_header = self._calculate_header_hash(file_path)
+                current_header = self._hasher.calculate_header_hash(file_path)
                 if current_header != stored.header_hash:
                     return FingerprintStatus.CHANGED
 
+                # Same size and header but touched (backups, rsync): CRC32 settles it far
+                # cheaper than the MD5 a CHANGED result would trigger
+                if stored.crc32 is not None:
+                    if not self.verify_crc32(stored):
+                        return FingerprintStatus.CHANGED
+                    # Record the new mtime so later scans skip the CRC pass. A copy is
+                    # queued so cached or prefetched fingerprints aren't changed under
+                    # their holders, and scan threads don't wait on a commit.
+                    file_key = self._generate_file_key(stored.file_path, stored.internal_path)
+                    self.add_fingerprint_deferred(
+                        file_key, replace(stored, modified_time=file_stat.st_mtime)
+                    )
+
             # Don't update database for unchanged files - this causes unnecessary writes
             # Only update when files actually change
             return FingerprintStatus.VALID
@@ -451,11 +805,175 @@ class ROMDatabase:
             self.logger.error(f"Failed to verify fingerprint: {e}")
             return FingerprintStatus.CORRUPTED
 
-    def batch_add_fingerprints(self, fingerprints: list[ROMFingerprint]) -> int:
+    def remove_fingerprints(self, file_keys: list[str]) -> int:
+        """Delete fingerprints by file key in a single transaction.
+
+        Args:
+            file_keys: File keys as returned by get_file_key.
+
+        Returns:
+            Number of fingerprints deleted.
+        """
+        if not file_keys:
+            return 0
+
+        try:
+            with self.pool.get_write_connection() as conn:
+                before = conn.total_changes
+                conn.executemany(DELETE_FINGERPRINT_SQL, ((key,) for key in file_keys))
+                conn.commit()
+                removed = conn.total_changes - before
+
+                self._operation_counter += removed
+                self._write_generation += 1
+                return removed
+
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to remove fingerprints: {e}")
+            return 0
+
+    def export_to(self, target_path: Path) -> bool:
+        """Copy the database to another file with SQLite's online backup.
+
+        Args:
+            target_path: Destination database file.
+
+        Returns:
+            True if successful.
+        """
+        try:
+            target_path.parent.mkdir(parents=True, exist_ok=True)
+            target = sqlite3.connect(str(target_path))
+            try:
+                with self.pool.get_connection() as conn:
+                    conn.backup(target)
+            finally:
+                target.close()
+            return True
+
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to export database to {target_path}: {e}")
+            return False
+
+    def import_from(self, source_path: Path, replace: bool = False) -> int:
+        """Copy fingerprints from another database file inside SQLite.
+
+        The source is attached read-only and never migrated; only the fingerprint
+        columns its schema version has are copied, the rest take their defaults.
+
+        Args:
+            source_path: Database file with a rom_fingerprints table.
+            replace: Delete existing fingerprints first instead of keeping them.
+
+        Returns:
+            Number of fingerprints imported.
+        """
+        try:
+            with self.pool.get_write_connection() as conn:
+                conn.execute(
+                    "ATTACH DATABASE ? AS source", (source_path.resolve().as_uri() + "?mode=ro",)
+                )
+                try:
+                    source_columns = {
+                        row[1] for row in conn.execute("PRAGMA source.table_info(rom_fingerprints)")
+                    }
+                    if "file_key" not in source_columns:
+                        raise sqlite3.DatabaseError("source has no usable rom_fingerprints table")
+                    columns = ", ".join(
+                        column
+                        for column in ("file_key", *FINGERPRINT_COLUMNS.split(", "))
+                        if column in source_columns
+                    )
+
+                    before = conn.total_changes
+                    if replace:
+                        conn.execute("DELETE FROM main.rom_fingerprints")
+                        before = conn.total_changes
+                    conn.execute(IMPORT_FINGERPRINTS_SQL.format(columns=columns))
+                    conn.commit()
+                    imported = conn.total_changes - before
+                except sqlite3.Error:
+                    conn.rollback()
+                    raise
+                finally:
+                    conn.execute("DETACH DATABASE source")
+
+                self._operation_counter += imported
+                self._write_generation += 1
+                return imported
+
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to import database from {source_path}: {e}")
+            return 0
+
+    def iter_fingerprints(self) -> Iterator[tuple[str, ROMFingerprint]]:
+        """Iterate over every stored fingerprint.
+
+        Yields:
+            Tuples of (file key, fingerprint).
+        """
+        try:
+            with self.pool.get_connection() as conn:
+                for row in conn.execute(SELECT_ALL_SQL):
+                    yield row[0], ROMFingerprint(*row[1:])
+
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to iterate fingerprints: {e}")
+
+    def iter_fingerprint_fields(self, *fields: str) -> Iterator[tuple[Any, ...]]:
+        """Iterate over selected columns of every fingerprint without building objects.
+
+        Args:
+            *fields: ROMFingerprint field names to read.
+
+        Yields:
+            Tuples of (file key, *field values).
+
+        Raises:
+            ValueError: If a name is not a fingerprint field.
+        """
+        unknown = set(fields) - FINGERPRINT_FIELDS
+        if unknown:
+            raise ValueError(f"Unknown fingerprint fields: {sorted(unknown)}")
+
+        columns = ", ".join(("file_key", *fields))
+        try:
+            with self.pool.get_connection() as conn:
+                yield from conn.execute(f"SELECT {columns} FROM rom_fingerprints")
+
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to iterate fingerprint fields: {e}")
+
+    def verify_crc32(self, fingerprint: ROMFingerprint) -> bool:
+        """Check a ROM's current CRC32 against its fingerprint, without computing MD5.
+
+        Args:
+            fingerprint: Stored fingerprint with a CRC32.
+
+        Returns:
+            True if the CRC32 still matches.
+        """
+        if fingerprint.crc32 is None:
+            return False
+
+        file_path = Path(fingerprint.file_path)
+        if fingerprint.internal_path:
+            # The archive index already records member CRCs
+            crc32_value = self._hasher.stored_member_crc32(file_path, fingerprint.internal_path)
+            if crc32_value is None:
+                crc32_value = self._hasher.calculate_crc32(file_path, fingerprint.internal_path)
+        else:
+            crc32_value = self._hasher.calculate_crc32(file_path)
+        return crc32_value == fingerprint.crc32
+
+    def batch_add_fingerprints(
+        self, fingerprints: list[ROMFingerprint], file_keys: list[str] | None = None
+    ) -> int:
         """Add multiple fingerprints in a single transaction.
 
         Args:
             fingerprints: List of fingerprints to add.
+            file_keys: Already generated file keys, parallel to fingerprints.
 
         Returns:
             Number of fingerprints successfully added.
@@ -463,23 +981,37 @@ class ROMDatabase:
         added_count = 0
 
         try:
-            with self.pool.get_connection() as conn:
-                for fingerprint in fingerprints:
-                    try:
-                        file_key = self._generate_file_key(
-                            Path(fingerprint.file_path),
-                            fingerprint.internal_path,
-                        )
-                        self._save_fingerprint(conn, file_key, fingerprint)
-                        added_count += 1
-
-                    except Exception as e:
-                        self.logger.error(
-                            f"Failed to add fingerprint for {fingerprint.file_path}: {e}"
-                        )
+            with self.pool.get_write_connection() as conn:
+                # Take the write lock once for the whole batch
+                if not conn.in_transaction:
+                    conn.execute("BEGIN IMMEDIATE")
+                try:
+                    for start in range(0, len(fingerprints), self.BATCH_SIZE):
+                        rows = []
+                        for index in range(start, min(start + self.BATCH_SIZE, len(fingerprints))):
+                            fingerprint = fingerprints[index]
+                            try:
+                                if file_keys is not None:
+                                    file_key = file_keys[index]
+                                else:
+                                    file_key = self._generate_file_key(
+                                        fingerprint.file_path, fingerprint.internal_path
+                                    )
+                                rows.append(self._fingerprint_row(file_key, fingerprint))
+                            except Exception as e:
+                                self.logger.error(
+                                    f"Failed to add fingerprint for {fingerprint.file_path}: {e}"
+                                )
+                        added_count += self._insert_rows(conn, rows)
+
+                    conn.commit()
+                except BaseException:
+                    conn.rollback()
+                    added_count = 0
+                    raise
 
-                conn.commit()
                 self._operation_counter += added_count
+                self._write_generation += 1
                 self._check_vacuum()
 
         except sqlite3.Error as e:
@@ -487,6 +1019,143 @@ class ROMDatabase:
 
         return added_count
 
+    def _insert_rows(self, conn: sqlite3.Connection, rows: list[tuple]) -> int:
+        """Insert prepared fingerprint rows, falling back to one row at a time on error.
+
+        Args:
+            conn: Database connection with an open transaction.
+            rows: Parameter tuples matching INSERT_FINGERPRINT_SQL.
+
+        Returns:
+            Number of rows inserted.
+        """
+        try:
+            conn.executemany(INSERT_FINGERPRINT_SQL, rows)
+            return len(rows)
+        except sqlite3.Error:
+            pass
+
+        # Retry individually so one bad row doesn't drop the rest of the sub-batch
+        inserted = 0
+        for row in rows:
+            try:
+                conn.execute(INSERT_FINGERPRINT_SQL, row)
+                inserted += 1
+            except sqlite3.Error as e:
+                self.logger.error(f"Failed to add fingerprint for {row[1]}: {e}")
+        return inserted
+
+    def get_directory_listing(
+        self, directory: str, mtime_ns: int
+    ) -> tuple[list[str], list[str]] | None:
+        """Get the cached listing of a directory if it hasn't changed since it was stored.
+
+        Adding, removing or renaming an entry updates a directory's mtime, so a matching
+        mtime means the listing still holds. Subdirectories are cached separately.
+
+        Args:
+            directory: Directory path.
+            mtime_ns: Directory's current st_mtime_ns.
+
+        Returns:
+            Tuple of (file names, subdirectory names), or None on a cache miss.
+        """
+        try:
+            with self.pool.get_connection() as conn:
+                row = conn.execute(SELECT_DIRECTORY_SQL, (directory, mtime_ns)).fetchone()
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to read directory cache for {directory}: {e}")
+            return None
+
+        if row is None:
+            return None
+        files, subdirectories = row
+        return (
+            files.split(LISTING_SEPARATOR) if files else [],
+            subdirectories.split(LISTING_SEPARATOR) if subdirectories else [],
+        )
+
+    def put_directory_listings(self, listings: list[tuple[str, int, list[str], list[str]]]) -> bool:
+        """Store directory listings in a single transaction.
+
+        Args:
+            listings: Tuples of (directory, st_mtime_ns, file names, subdirectory names).
+
+        Returns:
+            True if successful.
+        """
+        if not listings:
+            return True
+
+        try:
+            with self.pool.get_write_connection() as conn:
+                conn.executemany(
+                    UPSERT_DIRECTORY_SQL,
+                    (
+                        (
+                            directory,
+                            mtime_ns,
+                            LISTING_SEPARATOR.join(files),
+                            LISTING_SEPARATOR.join(subdirectories),
+                        )
+                        for directory, mtime_ns, files, subdirectories in listings
+                    ),
+                )
+                conn.commit()
+                return True
+
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to store directory listings: {e}")
+            return False
+
+    def prune_directory_listings(self, root: str, visited: set[str]) -> int:
+        """Delete cached listings under a root that its latest full walk didn't reach.
+
+        Directories that were removed or renamed are never listed again, so without
+        this their rows would stay in the cache forever.
+
+        Args:
+            root: Directory the walk started from.
+            visited: Every directory the walk listed, including root.
+
+        Returns:
+            Number of listings deleted.
+        """
+        prefix = os.path.join(root, "")
+        try:
+            with self.pool.get_write_connection() as conn:
+                stale = [
+                    (directory,)
+                    for (directory,) in conn.execute(
+                        SELECT_DIRECTORIES_UNDER_SQL, (root, len(prefix), prefix)
+                    )
+                    if directory not in visited
+                ]
+                if stale:
+                    conn.executemany(DELETE_DIRECTORY_SQL, stale)
+                    conn.commit()
+                return len(stale)
+
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to prune directory listings under {root}: {e}")
+            return 0
+
+    def clear_directory_listings(self) -> bool:
+        """Delete every cached directory listing; the next scan lists directories afresh.
+
+        Returns:
+            True if successful.
+        """
+        try:
+            with self.pool.get_write_connection() as conn:
+                conn.execute(CLEAR_DIRECTORY_CACHE_SQL)
+                conn.commit()
+                return True
+
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to clear directory listings: {e}")
+            return False
+
     def get_statistics(self) -> dict[str, Any]:
         """Get database statistics.
 
@@ -494,24 +1163,32 @@ class ROMDatabase:
             Dictionary with database statistics.
         """
         try:
-            with self.pool.get_connection() as conn:
-                total_cursor = conn.execute("SELECT COUNT(*) FROM rom_fingerprints")
-                total_count = total_cursor.fetchone()[0]
+            # Counts only change on writes, so reuse them until the next one
+            generation = self._write_generation
+            cached = self._stats_cache
+            if cached is not None and cached[0] == generation:
+                _, total_count, platform_counts = cached
+            else:
+                with self.pool.get_connection() as conn:
+                    total_cursor = conn.execute(COUNT_SQL)
+                    total_count = total_cursor.fetchone()[0]
 
-                platform_cursor = conn.execute(
-                    "SELECT platform, COUNT(*) FROM rom_fingerprints " "GROUP BY platform"
-                )
-                platform_counts = dict(platform_cursor.fetchall())
+                    platform_cursor = conn.execute(COUNT_BY_PLATFORM_SQL)
+                    platform_counts = dict(platform_cursor.fetchall())
+                self._stats_cache = (generation, total_count, platform_counts)
 
-                # Get database file size
-                db_size = self.db_path.stat().st_size if self.db_path.exists() else 0
+            # Get database file size with a single stat
+            try:
+                db_size = self.db_path.stat().st_size
+            except FileNotFoundError:
+                db_size = 0
 
-                return {
-                    "total_roms": total_count,
-                    "platforms": platform_counts,
-                    "database_size": db_size,
-                    "operations_since_vacuum": self._operation_counter,
-                }
+            return {
+                "total_roms": total_count,
+                "platforms": dict(platform_counts),
+                "database_size": db_size,
+                "operations_since_vacuum": self._operation_counter,
+            }
 
         except sqlite3.Error as e:
             self.logger.error(f"Failed to get statistics: {e}")
@@ -522,6 +1199,10 @@ class ROMDatabase:
         file_path: Path,
         internal_path: str | None = None,
         platform: str = "",
+        compute_md5: bool = True,
+        hashes: tuple[str, str, int | None] | None = None,
+        file_stat: os.stat_result | None = None,
+        content_path: Path | None = None,
     ) -> ROMFingerprint:
         """Create a new ROM fingerprint.
 
@@ -529,18 +1210,33 @@ class ROMDatabase:
             file_path: Path to ROM file.
             internal_path: Path within archive if applicable.
             platform: Platform identifier.
+            compute_md5: Whether to hash the full contents with MD5. When False, only
+                CRC32 and the header hash are computed and md5_hash is left as None, so
+                hash searches and RetroAchievements matching won't find the ROM.
+            hashes: Hashes already computed by ROMHasher.calculate_all_hashes; calculated
+                here if None.
+            file_stat: Stat of file_path if the caller already has one.
+            content_path: Already extracted copy of the archive member, hashed instead
+                of decompressing the member again.
 
         Returns:
             New ROM fingerprint.
         """
         try:
             # Get file stats
-            file_stat = file_path.stat()
-
-            # Calculate hashes
-            header_hash = self._calculate_header_hash(file_path)
-            md5_hash = self._calculate_md5(file_path, internal_path)
-            crc32_value = self._calculate_crc32(file_path, internal_path)
+            if file_stat is None:
+                file_stat = file_path.stat()
+
+            # Calculate hashes in a single pass over the ROM data
+            if hashes is None and content_path is not None:
+                # The header hash covers the archive itself, matching verify_fingerprint
+                md5_hash, _, crc32_value = self._hasher.calculate_all_hashes(
+                    content_path, None, compute_md5
+                )
+                hashes = md5_hash, self._hasher.calculate_header_hash(file_path), crc32_value
+            elif hashes is None:
+                hashes = self._hasher.calculate_all_hashes(file_path, internal_path, compute_md5)
+            md5_hash, header_hash, crc32_value = hashes
 
             # Extract region and revision from filename using existing utility
             # Use platform parameter if provided
@@ -587,7 +1283,7 @@ class ROMDatabase:
                 file_path=str(file_path),
                 file_size=file_stat.st_size,
                 modified_time=file_stat.st_mtime,
-                md5_hash=md5_hash,
+                md5_hash=md5_hash if compute_md5 else None,
                 header_hash=header_hash,
                 crc32=crc32_value,
                 archive_path=archive_path,
@@ -623,7 +1319,7 @@ class ROMDatabase:
             True if successful.
         """
         try:
-            with self.pool.get_connection() as conn:
+            with self.pool.get_write_connection() as conn:
                 self.logger.info("Vacuuming database...")
                 conn.execute("VACUUM")
                 conn.execute("ANALYZE")
@@ -636,177 +1332,70 @@ class ROMDatabase:
             self.logger.error(f"Vacuum failed: {e}")
             return False
 
-    def _check_vacuum(self) -> None:
-        """Check if database needs vacuuming."""
-        if not self.auto_vacuum:
-            return
-
-        # Vacuum after significant operations or time interval
-        if (
-            self._operation_counter > 1000
-            or (time.time() - self._last_vacuum_time) > self._vacuum_interval
-        ):
-            self.vacuum()
-
-    def _generate_file_key(
-        self,
-        file_path: Path,
-        internal_path: str | None = None,
-    ) -> str:
-        """Generate unique key for ROM entry.
-
-        Args:
-            file_path: Path to ROM file or archive.
-            internal_path: Path within archive if applicable.
+    def optimize(self) -> bool:
+        """Let SQLite refresh query planner statistics where they are stale.
 
         Returns:
-            Unique string key.
+            True if successful.
         """
-        if internal_path:
-            return f"{file_path.as_posix()}#{internal_path}"
-        return file_path.as_posix()
+        try:
+            with self.pool.get_write_connection() as conn:
+                conn.execute("PRAGMA optimize")
+                if self._wal_needs_compaction():
+                    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                self._last_optimize_time = time.time()
+                return True
 
-    def _calculate_crc32(self, file_path: Path, internal_path: str | None = None) -> int:
-        """Calculate CRC32 checksum of ROM file.
+        except sqlite3.Error as e:
+            self.logger.error(f"Optimize failed: {e}")
+            return False
 
-        Args:
-            file_path: Path to ROM file or archive.
-            internal_path: Path within archive if applicable.
+    def _wal_needs_compaction(self) -> bool:
+        """Check whether the write-ahead log has grown large relative to the database.
 
         Returns:
-            CRC32 checksum as integer.
+            True if the WAL should be checkpointed and truncated.
         """
         try:
-            crc32_value = 0
-            buffer_size = 1024 * 1024  # 1MB buffer
-
-            if internal_path:
-                # Handle archive files
-                archive_ext = file_path.suffix.lower()
-
-                if archive_ext == ".zip":
-                    import zipfile
-
-                    with zipfile.ZipFile(file_path, "r") as zip_file:
-                        with zip_file.open(internal_path) as rom_file:
-                            while chunk := rom_file.read(buffer_size):
-                                crc32_value = zlib.crc32(chunk, crc32_value)
-                elif archive_ext == ".7z":
-                    try:
-                        import py7zr
-
-                        with py7zr.SevenZipFile(file_path, mode="r") as archive:
-                            extracted = archive.read([internal_path])
-                            if internal_path in extracted:
-                                data = extracted[internal_path].read()
-                                crc32_value = zlib.crc32(data)
-                    except ImportError:
-                        self.logger.warning("py7zr not available for 7z CRC32 calculation")
-                        return 0
-                elif archive_ext == ".rar":
-                    try:
-                        import rarfile
-
-                        with rarfile.RarFile(file_path) as rar_file:
-                            with rar_file.open(internal_path) as rom_file:
-                                while chunk := rom_file.read(buffer_size):
-                                    crc32_value = zlib.crc32(chunk, crc32_value)
-                    except ImportError:
-                        self.logger.warning("rarfile not available for RAR CRC32 calculation")
-                        return 0
-                else:
-                    return 0
-            else:
-                # Handle direct files with buffered reading
-                with open(file_path, "rb") as f:
-                    while chunk := f.read(buffer_size):
-                        crc32_value = zlib.crc32(chunk, crc32_value)
-
-            # CRC32 can be negative in Python, convert to unsigned
-            return crc32_value & 0xFFFFFFFF
+            wal_size = os.stat(f"{self.db_path}-wal").st_size
+            db_size = self.db_path.stat().st_size
+        except OSError:
+            return False
+        return wal_size > db_size * self.WAL_COMPACT_RATIO
 
-        except Exception as e:
-            self.logger.error(f"Failed to calculate CRC32 for {file_path}: {e}")
-            return 0
+    def _check_vacuum(self) -> None:
+        """Check if database needs vacuuming or a periodic optimize."""
+        if time.time() - self._last_optimize_time > self._optimize_interval:
+            self.optimize()
 
-    def _calculate_header_hash(self, file_path: Path) -> str:
-        """Calculate hash of first 1KB for quick verification.
+        if not self.auto_vacuum:
+            return
 
-        Args:
-            file_path: Path to file.
+        # Vacuum after significant operations or time interval
+        if (
+            self._operation_counter > 1000
+            or (time.time() - self._last_vacuum_time) > self._vacuum_interval
+        ):
+            self.vacuum()
 
-        Returns:
-            SHA256 hash of header.
-        """
-        try:
-            with open(file_path, "rb") as f:
-                header_data = f.read(1024)
-            return hashlib.sha256(header_data).hexdigest()
-        except Exception as e:
-            self.logger.error(f"Failed to calculate header hash: {e}")
-            return ""
+    @staticmethod
+    @functools.lru_cache(maxsize=65536)
+    def _generate_file_key(path_str: str, internal_path: str | None) -> str:
+        """Generate unique key for ROM entry.
 
-    def _calculate_md5(self, file_path: Path, internal_path: str | None = None) -> str:
-        """Calculate MD5 hash of ROM file.
+        Cached because verify, get and add compute the same key for each ROM.
 
         Args:
-            file_path: Path to ROM file or archive.
+            path_str: Path to ROM file or archive, as a string.
             internal_path: Path within archive if applicable.
 
         Returns:
-            MD5 hash as hex string.
+            Unique string key.
         """
-        try:
-            md5_hash = hashlib.md5()
-            buffer_size = 1024 * 1024  # 1MB buffer
-
-            if internal_path:
-                # Handle archive files
-                archive_ext = file_path.suffix.lower()
-
-                if archive_ext == ".zip":
-                    import zipfile
-
-                    with zipfile.ZipFile(file_path, "r") as zip_file:
-                        with zip_file.open(internal_path) as rom_file:
-                            while chunk := rom_file.read(buffer_size):
-                                md5_hash.update(chunk)
-                elif archive_ext == ".7z":
-                    try:
-                        import py7zr
-
-                        with py7zr.SevenZipFile(file_path, mode="r") as archive:
-                            extracted = archive.read([internal_path])
-                            if internal_path in extracted:
-                                data = extracted[internal_path].read()
-                                md5_hash.update(data)
-                    except ImportError:
-                        self.logger.warning("py7zr not available for 7z MD5 calculation")
-                        return ""
-                elif archive_ext == ".rar":
-                    try:
-                        import rarfile
-
-                        with rarfile.RarFile(file_path) as rar_file:
-                            with rar_file.open(internal_path) as rom_file:
-                                while chunk := rom_file.read(buffer_size):
-                                    md5_hash.update(chunk)
-                    except ImportError:
-                        self.logger.warning("rarfile not available for RAR MD5 calculation")
-                        return ""
-                else:
-                    return ""
-            else:
-                # Handle direct files with buffered reading
-                with open(file_path, "rb") as f:
-                    while chunk := f.read(buffer_size):
-                        md5_hash.update(chunk)
-
-            return md5_hash.hexdigest()
-
-        except Exception as e:
-            self.logger.error(f"Failed to calculate MD5 for {file_path}: {e}")
-            return ""
+        posix_path = Path(path_str).as_posix()
+        if internal_path:
+            return f"{posix_path}#{internal_path}"
+        return posix_path
 
     def _save_fingerprint(
         self,
@@ -821,88 +1410,64 @@ class ROMDatabase:
             file_key: Unique file key.
             fingerprint: ROM fingerprint to save.
         """
-        data_json = json.dumps(asdict(fingerprint))
-
-        conn.execute(
-            """
-            INSERT OR REPLACE INTO rom_fingerprints (
-                file_key, file_path, file_size, modified_time,
-                md5_hash, header_hash, crc32,
-                archive_path, internal_path, archive_modified_time,
-                platform, region, revision,
-                ra_game_id, ra_hash, ra_title, ra_last_check,
-                created_time, last_verified_time, verification_count,
-                data_json
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                file_key,
-                fingerprint.file_path,
-                fingerprint.file_size,
-                fingerprint.modified_time,
-                fingerprint.md5_hash,
-                fingerprint.header_hash,
-                fingerprint.crc32,
-                fingerprint.archive_path,
-                fingerprint.internal_path,
-                fingerprint.archive_modified_time,
-                fingerprint.platform,
-                fingerprint.region,
-                fingerprint.revision,
-                fingerprint.ra_game_id,
-                fingerprint.ra_hash,
-                fingerprint.ra_title,
-                fingerprint.ra_last_check,
-                fingerprint.created_time,
-                fingerprint.last_verified_time,
-                fingerprint.verification_count,
-                data_json,
-            ),
+        conn.execute(INSERT_FINGERPRINT_SQL, self._fingerprint_row(file_key, fingerprint))
+
+    def _fingerprint_row(self, file_key: str, fingerprint: ROMFingerprint) -> tuple:
+        """Build the INSERT parameters for a fingerprint.
+
+        Args:
+            file_key: Unique file key.
+            fingerprint: ROM fingerprint to save.
+
+        Returns:
+            Parameter tuple matching INSERT_FINGERPRINT_SQL.
+        """
+        return (
+            file_key,
+            fingerprint.file_path,
+            fingerprint.file_size,
+            fingerprint.modified_time,
+            fingerprint.md5_hash,
+            fingerprint.header_hash,
+            fingerprint.crc32,
+            fingerprint.archive_path,
+            fingerprint.internal_path,
+            fingerprint.archive_modified_time,
+            fingerprint.platform,
+            fingerprint.region,
+            fingerprint.revision,
+            fingerprint.ra_game_id,
+            fingerprint.ra_hash,
+            fingerprint.ra_title,
+            fingerprint.ra_last_check,
+            fingerprint.created_time,
+            fingerprint.last_verified_time,
+            fingerprint.verification_count,
         )
 
-    def _row_to_fingerprint(self, row: sqlite3.Row) -> ROMFingerprint:
+    def _row_to_fingerprint(self, row: tuple) -> ROMFingerprint:
         """Convert database row to ROMFingerprint.
 
         Args:
-            row: Database row.
+            row: Database row selected with FINGERPRINT_COLUMNS.
 
         Returns:
             ROMFingerprint object.
         """
-        # Get column names from row
-        columns = row.keys() if hasattr(row, "keys") else []
-
-        return ROMFingerprint(
-            file_path=row["file_path"],
-            file_size=row["file_size"],
-            modified_time=row["modified_time"],
-            md5_hash=row["md5_hash"],
-            header_hash=row["header_hash"],
-            crc32=row["crc32"],
-            archive_path=row["archive_path"],
-            internal_path=row["internal_path"],
-            archive_modified_time=row["archive_modified_time"],
-            platform=row["platform"],
-            region=row["region"],
-            revision=row["revision"],
-            ra_game_id=row["ra_game_id"] if "ra_game_id" in columns else None,
-            ra_hash=row["ra_hash"] if "ra_hash" in columns else None,
-            ra_title=row["ra_title"] if "ra_title" in columns else None,
-            ra_last_check=row["ra_last_check"] if "ra_last_check" in columns else 0.0,
-            created_time=row["created_time"],
-            last_verified_time=row["last_verified_time"],
-            verification_count=row["verification_count"],
-        )
+        return ROMFingerprint(*row)
+
+    def release_archives(self) -> None:
+        """Close cached archive handles so the files can be moved or deleted."""
+        self._hasher.release_archives()
 
     def close(self) -> None:
         """Close all database connections."""
+        # Commit anything still queued for the background writer
+        self.flush()
+        self.release_archives()
+
         # Close all pooled connections
-        while not self.pool._connections.empty():
-            try:
-                conn = self.pool._connections.get(block=False)
-                conn.close()
-            except:
-                break
+        self.pool.close()
 
         self.logger.info("Database connections closed")
 
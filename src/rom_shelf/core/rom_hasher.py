@@ -0,0 +1,457 @@
+"""File and archive-member hashing for ROM fingerprints."""
+
+import functools
+import hashlib
+import logging
+import mmap
+import os
+import threading
+import zipfile
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+try:
+    from isal import isal_zlib
+
+    HAS_ISAL = True
+except ImportError:
+    HAS_ISAL = False
+
+try:
+    import py7zr
+
+    HAS_PY7ZR = True
+except ImportError:
+    HAS_PY7ZR = False
+
+try:
+    import rarfile
+
+    HAS_RARFILE = True
+except ImportError:
+    HAS_RARFILE = False
+
+# isal's crc32 uses the same polynomial as zlib, so stored values stay comparable
+_crc32 = isal_zlib.crc32 if HAS_ISAL else zlib.crc32
+
+
+def _fadvise(fd: int, advice_name: str) -> None:
+    """Pass an access-pattern hint for a whole file to the kernel where supported.
+
+    Args:
+        fd: Open file descriptor.
+        advice_name: Name of the os.POSIX_FADV_* constant to apply.
+    """
+    advice = getattr(os, advice_name, None)
+    if advice is None:
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, advice)
+    except OSError:
+        pass
+
+
+@functools.cache
+def _warn_missing_archive_support(module: str) -> None:
+    """Log once per module that an archive format can't be hashed.
+
+    Args:
+        module: Name of the missing archive module.
+    """
+    logging.getLogger(__name__).warning(f"{module} not available; skipping those archives")
+
+
+class _HashWriter:
+    """py7zr extraction target that hashes member data instead of storing it."""
+
+    def __init__(self, compute_md5: bool = True) -> None:
+        """Initialize empty CRC32 state, and MD5 state when requested."""
+        self.md5 = hashlib.md5() if compute_md5 else None
+        self.crc32 = 0
+        self._size = 0
+
+    def write(self, data: bytes | bytearray) -> int:
+        """Feed decompressed data into the hashes."""
+        if self.md5 is not None:
+            self.md5.update(data)
+        self.crc32 = _crc32(data, self.crc32)
+        self._size += len(data)
+        return len(data)
+
+    def read(self, size: int | None = None) -> bytes:
+        """Nothing is stored, so there is nothing to read back."""
+        return b""
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        """Hashing is sequential; report the current position."""
+        return self._size
+
+    def seekable(self) -> bool:
+        """Tell py7zr not to rewind after extraction."""
+        return False
+
+    def flush(self) -> None:
+        """Nothing is buffered."""
+
+    def size(self) -> int:
+        """Get the number of bytes hashed so far."""
+        return self._size
+
+    def close(self) -> None:
+        """Nothing to release."""
+
+
+class _HashWriterFactory:
+    """py7zr writer factory that hands out a single hash writer."""
+
+    def __init__(self, writer: _HashWriter) -> None:
+        """Initialize the factory with the writer to hand out."""
+        self._writer = writer
+
+    def create(self, filename: str) -> _HashWriter:
+        """Return the hash writer for the extracted member."""
+        return self._writer
+
+
+class ROMHasher:
+    """Computes the MD5, CRC32 and header hashes stored in ROM fingerprints.
+
+    Holds no database state, so it can be created anywhere hashing is needed.
+    """
+
+    # Files larger than this are hashed through a memory map instead of read() copies
+    MMAP_MIN_SIZE = 16 * 1024 * 1024
+    # Open zip/RAR handles kept so sets with many ROMs parse their directory once
+    ARCHIVE_CACHE_SIZE = 16
+    # Largest read per call when hashing; fewer syscalls and room for kernel readahead
+    HASH_BUFFER_SIZE = 8 * 1024 * 1024
+    # Span of a mapping fed to every hash before moving on to the next one
+    MMAP_WINDOW_SIZE = 8 * 1024 * 1024
+
+    def __init__(self) -> None:
+        """Initialize the hasher with an empty archive handle cache."""
+        self.logger = logging.getLogger(__name__)
+
+        # Open archive handles keyed by (path, mtime), least recently used first
+        self._archive_cache: OrderedDict[tuple[str, int], Any] = OrderedDict()
+        self._archive_cache_lock = threading.Lock()
+
+    def calculate_all_hashes(
+        self, file_path: Path, internal_path: str | None = None, compute_md5: bool = True
+    ) -> tuple[str, str, int | None]:
+        """Calculate MD5, header hash and CRC32 with one read of the ROM data.
+
+        Args:
+            file_path: Path to ROM file or archive.
+            internal_path: Path within archive if applicable.
+            compute_md5: Whether to compute the MD5; "" is returned for it otherwise.
+
+        Returns:
+            Tuple of (MD5 hex digest, SHA256 hex digest of the first 1KB, unsigned CRC32),
+            with a None CRC32 when the data couldn't be read.
+        """
+        if internal_path:
+            # The header hash covers the archive file itself, matching verify_fingerprint
+            header_hash = self.calculate_header_hash(file_path)
+            md5_hash, crc32_value = self._hash_archive_member(file_path, internal_path, compute_md5)
+            return md5_hash, header_hash, crc32_value
+
+        try:
+            with open(file_path, "rb", buffering=0) as f:
+                fd = f.fileno()
+                file_size = os.fstat(fd).st_size
+                _fadvise(fd, "POSIX_FADV_SEQUENTIAL")
+                if file_size > self.MMAP_MIN_SIZE:
+                    try:
+                        return self._hash_mapped(fd, compute_md5)
+                    finally:
+                        # Don't let one huge image push the rest of the library out of cache
+                        _fadvise(fd, "POSIX_FADV_DONTNEED")
+
+                md5_hash = hashlib.md5() if compute_md5 else None
+                crc32_value = 0
+                # Sized to the file (+1 so the final read sees EOF) up to the buffer cap
+                buffer = bytearray(min(file_size + 1, self.HASH_BUFFER_SIZE))
+                view = memoryview(buffer)
+                # Bind the per-chunk calls to locals once, outside the loop
+                readinto = f.readinto
+                update_md5 = md5_hash.update if md5_hash is not None else None
+                crc32 = _crc32
+                size = readinto(buffer)
+                header_hash = hashlib.sha256(view[: min(size, 1024)]).hexdigest()
+                while size:
+                    chunk = view[:size]
+                    if update_md5 is not None:
+                        update_md5(chunk)
+                    crc32_value = crc32(chunk, crc32_value)
+                    size = readinto(buffer)
+
+            md5_hex = md5_hash.hexdigest() if md5_hash is not None else ""
+            return md5_hex, header_hash, crc32_value & 0xFFFFFFFF
+
+        except Exception as e:
+            self.logger.error(f"Failed to calculate hashes for {file_path}: {e}")
+            return "", "", None
+
+    def _hash_mapped(self, fd: int, compute_md5: bool = True) -> tuple[str, str, int]:
+        """Calculate MD5, header hash and CRC32 over a memory-mapped file.
+
+        Args:
+            fd: Open file descriptor of the ROM.
+            compute_md5: Whether to compute the MD5; "" is returned for it otherwise.
+
+        Returns:
+            Tuple of (MD5 hex digest, SHA256 hex digest of the first 1KB, unsigned CRC32).
+        """
+        with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            md5_hash = hashlib.md5() if compute_md5 else None
+            crc32_value = 0
+            with memoryview(mm) as view:
+                header_hash = hashlib.sha256(view[:1024]).hexdigest()
+                # Feed both hashes window by window so each page is hashed twice while it
+                # is still cached, instead of faulting a file bigger than RAM in twice
+                for offset in range(0, len(view), self.MMAP_WINDOW_SIZE):
+                    with view[offset : offset + self.MMAP_WINDOW_SIZE] as window:
+                        if md5_hash is not None:
+                            md5_hash.update(window)
+                        crc32_value = _crc32(window, crc32_value)
+        md5_hex = md5_hash.hexdigest() if md5_hash is not None else ""
+        return md5_hex, header_hash, crc32_value & 0xFFFFFFFF
+
+    def _hash_archive_member(
+        self, file_path: Path, internal_path: str, compute_md5: bool = True
+    ) -> tuple[str, int | None]:
+        """Calculate MD5 and CRC32 of an archive member while reading it once.
+
+        Args:
+            file_path: Path to archive.
+            internal_path: Path within archive.
+            compute_md5: Whether to compute the MD5. Without it the CRC32 recorded in
+                the archive's own index is used when available, skipping decompression.
+
+        Returns:
+            Tuple of (MD5 hex digest, unsigned CRC32), or ("", None) on failure.
+        """
+        try:
+            buffer_size = self.HASH_BUFFER_SIZE
+            archive_ext = file_path.suffix.lower()
+
+            if not compute_md5:
+                stored_crc = self.stored_member_crc32(file_path, internal_path)
+                if stored_crc is not None:
+                    return "", stored_crc
+
+            if archive_ext == ".7z":
+                if not HAS_PY7ZR:
+                    _warn_missing_archive_support("py7zr")
+                    return "", None
+
+                return self._hash_7z_member(file_path, internal_path, compute_md5)
+
+            archive = self._open_archive(file_path)
+            if archive is None:
+                return "", None
+
+            md5_hash = hashlib.md5() if compute_md5 else None
+            crc32_value = 0
+            update_md5 = md5_hash.update if md5_hash is not None else None
+            crc32 = _crc32
+            with archive.open(internal_path) as rom_file:
+                read = rom_file.read
+                while chunk := read(buffer_size):
+                    if update_md5 is not None:
+                        update_md5(chunk)
+                    crc32_value = crc32(chunk, crc32_value)
+            md5_hex = md5_hash.hexdigest() if md5_hash is not None else ""
+            return md5_hex, crc32_value & 0xFFFFFFFF
+
+        except Exception as e:
+            self.logger.error(f"Failed to hash {internal_path} in {file_path}: {e}")
+            return "", None
+
+    def _hash_7z_member(
+        self, file_path: Path, internal_path: str, compute_md5: bool = True
+    ) -> tuple[str, int | None]:
+        """Decompress a 7z member straight into the hashes without storing it.
+
+        Args:
+            file_path: Path to 7z archive.
+            internal_path: Path within archive.
+            compute_md5: Whether to compute the MD5.
+
+        Returns:
+            Tuple of (MD5 hex digest, unsigned CRC32), or ("", None) if the member
+            isn't in the archive.
+        """
+        writer = _HashWriter(compute_md5)
+        with py7zr.SevenZipFile(file_path, mode="r") as archive:
+            if internal_path not in archive.getnames():
+                return "", None
+            archive.extract(targets=[internal_path], factory=_HashWriterFactory(writer))
+        md5_hex = writer.md5.hexdigest() if writer.md5 is not None else ""
+        return md5_hex, writer.crc32 & 0xFFFFFFFF
+
+    def _open_archive(self, file_path: Path) -> Any | None:
+        """Get an open zip or RAR handle for an archive, reusing a cached one.
+
+        Cached handles stay valid until the archive's mtime changes or release_archives()
+        is called. zipfile and rarfile both allow concurrent member reads on one handle.
+
+        Args:
+            file_path: Path to archive.
+
+        Returns:
+            Open archive, or None if the format isn't handled here.
+        """
+        archive_ext = file_path.suffix.lower()
+        if archive_ext == ".zip":
+            opener = zipfile.ZipFile
+        elif archive_ext == ".rar":
+            if not HAS_RARFILE:
+                _warn_missing_archive_support("rarfile")
+                return None
+            opener = rarfile.RarFile
+        else:
+            return None
+
+        key = (str(file_path), file_path.stat().st_mtime_ns)
+        with self._archive_cache_lock:
+            archive = self._archive_cache.get(key)
+            if archive is not None:
+                self._archive_cache.move_to_end(key)
+                return archive
+
+        # Parse the directory outside the lock; a racing thread's handle wins below
+        archive = opener(file_path)
+        with self._archive_cache_lock:
+            cached = self._archive_cache.get(key)
+            if cached is not None:
+                archive.close()
+                self._archive_cache.move_to_end(key)
+                return cached
+
+            self._archive_cache[key] = archive
+            if len(self._archive_cache) > self.ARCHIVE_CACHE_SIZE:
+                _, evicted = self._archive_cache.popitem(last=False)
+                # zipfile keeps the file open until members still being read are closed
+                evicted.close()
+        return archive
+
+    def release_archives(self) -> None:
+        """Close cached archive handles so the files can be moved or deleted."""
+        with self._archive_cache_lock:
+            archives = list(self._archive_cache.values())
+            self._archive_cache.clear()
+        for archive in archives:
+            archive.close()
+
+    def stored_member_crc32(self, file_path: Path, internal_path: str) -> int | None:
+        """Read an archive member's CRC32 from the archive index without decompressing.
+
+        Args:
+            file_path: Path to archive.
+            internal_path: Path within archive.
+
+        Returns:
+            Unsigned CRC32, or None when the archive doesn't record one.
+        """
+        try:
+            archive_ext = file_path.suffix.lower()
+            if archive_ext == ".zip":
+                return self._open_archive(file_path).getinfo(internal_path).CRC
+            if archive_ext == ".7z" and HAS_PY7ZR:
+                with py7zr.SevenZipFile(file_path, mode="r") as archive:
+                    for info in archive.list():
+                        if info.filename == internal_path:
+                            return info.crc32
+                return None
+            if archive_ext == ".rar" and HAS_RARFILE:
+                # RAR5 archives may store a BLAKE2 checksum instead of a CRC32
+                return self._open_archive(file_path).getinfo(internal_path).CRC or None
+        except Exception as e:
+            self.logger.debug(f"No stored CRC32 for {internal_path} in {file_path}: {e}")
+        return None
+
+    def calculate_crc32(self, file_path: Path, internal_path: str | None = None) -> int | None:
+        """Calculate CRC32 checksum of ROM file.
+
+        Args:
+            file_path: Path to ROM file or archive.
+            internal_path: Path within archive if applicable.
+
+        Returns:
+            Unsigned CRC32, or None if it couldn't be computed.
+        """
+        try:
+            crc32_value = 0
+            buffer_size = self.HASH_BUFFER_SIZE
+
+            if internal_path:
+                # Handle archive files
+                archive_ext = file_path.suffix.lower()
+
+                if archive_ext == ".zip":
+                    with self._open_archive(file_path).open(internal_path) as rom_file:
+                        while chunk := rom_file.read(buffer_size):
+                            crc32_value = _crc32(chunk, crc32_value)
+                elif archive_ext == ".7z":
+                    if not HAS_PY7ZR:
+                        _warn_missing_archive_support("py7zr")
+                        return None
+                    return self._hash_7z_member(file_path, internal_path, compute_md5=False)[1]
+                elif archive_ext == ".rar":
+                    if not HAS_RARFILE:
+                        _warn_missing_archive_support("rarfile")
+                        return None
+                    with self._open_archive(file_path).open(internal_path) as rom_file:
+                        while chunk := rom_file.read(buffer_size):
+                            crc32_value = _crc32(chunk, crc32_value)
+                else:
+                    return None
+            else:
+                with open(file_path, "rb", buffering=0) as f:
+                    file_size = os.fstat(f.fileno()).st_size
+                    _fadvise(f.fileno(), "POSIX_FADV_SEQUENTIAL")
+                    if file_size > self.MMAP_MIN_SIZE:
+                        # One crc32 call over the mapping; the kernel handles readahead
+                        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                            with memoryview(mm) as view:
+                                crc32_value = _crc32(view)
+                        _fadvise(f.fileno(), "POSIX_FADV_DONTNEED")
+                    else:
+                        buffer = bytearray(min(file_size + 1, buffer_size))
+                        view = memoryview(buffer)
+                        readinto = f.readinto
+                        crc32 = _crc32
+                        while size := readinto(buffer):
+                            crc32_value = crc32(view[:size], crc32_value)
+
+            # CRC32 can be negative in Python, convert to unsigned
+            return crc32_value & 0xFFFFFFFF
+
+        except Exception as e:
+            self.logger.error(f"Failed to calculate CRC32 for {file_path}: {e}")
+            return None
+
+    def calculate_header_hash(self, file_path: Path) -> str:
+        """Calculate hash of first 1KB for quick verification.
+
+        Args:
+            file_path: Path to file.
+
+        Returns:
+            SHA256 hash of header.
+        """
+        try:
+            # Unbuffered: a single 1KB read() without allocating an io buffer per file.
+            # hashlib's OpenSSL sha256 already uses SHA-NI where the CPU has it.
+            with open(file_path, "rb", buffering=0) as f:
+                header_data = f.read(1024)
+            return hashlib.sha256(header_data).hexdigest()
+        except Exception as e:
+            self.logger.error(f"Failed to calculate header hash: {e}")
+            return ""
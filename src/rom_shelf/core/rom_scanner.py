@@ -3,6 +3,7 @@
 import concurrent.futures
 import logging
 import os
+import sys
 import threading
 import time
 from pathlib import Path
@@ -13,10 +14,13 @@ from ..models.rom_entry import ROMEntry
 from ..platforms.core.base_platform import BasePlatform
 from ..services.retroachievements_service import RetroAchievementsService
 from .archive_processor import ArchiveProcessor
-from .extension_handler import FileHandlingType, extension_registry
+from .extension_handler import ExtensionHandler, FileHandlingType, extension_registry
 
 # Removed multi_file_validator - now handled by platforms
-from .rom_database import FingerprintStatus, get_rom_database
+from .rom_database import FingerprintStatus, ROMFingerprint, get_rom_database
+
+# Marks a file key that was not part of the scan's bulk fingerprint lookup
+_NOT_PREFETCHED = object()
 
 
 class ScanProgress:
@@ -44,10 +48,21 @@ class ROMScanner(QObject):
 
     # Signals
     progress_updated = Signal(object)  # ScanProgress
-    rom_found = Signal(object)  # ROMEntry
+    roms_found = Signal(list)  # List[ROMEntry], delivered in batches
     scan_completed = Signal(list)  # List[ROMEntry]
     scan_error = Signal(str)  # Error message
 
+    # Directories modified more recently than this are rescanned rather than cached;
+    # covers coarse mtime resolution on FAT and network filesystems
+    DIRECTORY_CACHE_SETTLE_NS = 2_000_000_000
+    # Independently locked partitions of the processed-files set, so workers marking
+    # different files rarely wait on each other
+    PROCESSED_FILES_SHARDS = 16
+    # Minimum seconds between progress signals; each one is marshalled to the UI thread
+    PROGRESS_EMIT_INTERVAL = 0.1
+    # Found ROMs are handed to the UI in batches of this size
+    ROM_FOUND_BATCH_SIZE = 50
+
     def __init__(self) -> None:
         """Initialize the ROM scanner."""
         super().__init__()
@@ -73,6 +88,8 @@ class ROMScanner(QObject):
         self._is_scanning = False
         self._should_stop = False
         self._progress_lock = threading.Lock()
+        # Fingerprints of the files being scanned, looked up in one query per scan
+        self._known_fingerprints: dict[str, ROMFingerprint | None] = {}
         self._max_workers = min(
             32, (os.cpu_count() or 1) + 4
         )  # Use more threads for I/O-bound work
@@ -88,17 +105,15 @@ class ROMScanner(QObject):
         try:
             all_entries = []
             progress = ScanProgress()
-
             # Collect all files from all platform directories
-            all_files = []
-            platform_file_map = {}  # Maps file paths to their platforms
+            platform_file_map: dict[str, list[dict]] = {}  # Maps file paths to their platforms
 
             for config in platform_configs:
                 platform = config["platform"]
                 directories = config.get("directories", [])
                 scan_subdirectories = config.get("scan_subdirectories", True)
 
-                platform_files = []
+                platform_files: list[str] = []
                 for directory in directories:
                     # Normalize path - handle both forward and backward slashes
                     dir_path = Path(directory).resolve()
@@ -114,26 +129,31 @@ class ROMScanner(QObject):
                             f"Directory does not exist or is not accessible: {dir_path}"
                         )
 
-                # Map files to their platform
+                # Map files to their platform, leaving out ones it can never turn into ROMs
+                accepted_extensions = self._accepted_extensions(config)
+                splitext = os.path.splitext
                 for file_path in platform_files:
-                    if file_path not in platform_file_map:
-                        platform_file_map[file_path] = []
-                    platform_file_map[file_path].append(config)
-
-                all_files.extend(platform_files)
+                    if splitext(file_path)[1].lower() in accepted_extensions:
+                        platform_file_map.setdefault(file_path, []).append(config)
 
-            # Remove duplicates while preserving platform mapping
-            unique_files = list(set(all_files))
+            # Each file appears once in the map however many platforms claim it
+            unique_files = list(platform_file_map)
             progress.total_files = len(unique_files)
 
+            # Fetch stored fingerprints for every collected file with a single query
+            file_keys = [self._rom_database.get_file_key(file_path) for file_path in unique_files]
+            found = self._rom_database.get_fingerprints_bulk(file_keys)
+            self._known_fingerprints = {key: found.get(key) for key in file_keys}
+
             # Process files using multi-threading for better performance
             all_entries = self._process_files_multithreaded(
                 unique_files, platform_file_map, progress
             )
 
+            # Commit queued fingerprints before anyone reacts to the finished scan
+            self._rom_database.flush()
             self.scan_completed.emit(all_entries)
 
-            # Database auto-commits in SQLite
             self.logger.info(f"Scan completed with {len(all_entries)} ROM entries")
 
         except Exception as e:
@@ -141,7 +161,28 @@ class ROMScanner(QObject):
 
         finally:
             self._is_scanning = False
+            self._known_fingerprints = {}
             self._archive_processor.cleanup()
+            self._rom_database.release_archives()
+
+    def _accepted_extensions(self, config: dict) -> frozenset[str]:
+        """Get the file extensions a platform config can produce ROM entries from.
+
+        Args:
+            config: Platform scan configuration
+
+        Returns:
+            Lowercase extensions, including archives when the config handles them
+        """
+        platform = config["platform"]
+        extensions = {
+            ext.lower() for ext in config.get("supported_formats", platform.supported_handlers)
+        }
+        if config.get("handle_archives", True):
+            extensions.update(extension_registry.get_archive_extensions())
+        # Any part of a multi-file set can lead to its primary file
+        extensions.update(extension_registry.get_multi_file_extensions())
+        return frozenset(extensions)
 
     def _handle_ra_progress(self, event_type: str, data: dict) -> None:
         """Handle progress updates from RetroAchievements service.
@@ -183,7 +224,7 @@ class ROMScanner(QObject):
         self._should_stop = True
 
     def _process_files_multithreaded(
-        self, unique_files: list[Path], platform_file_map: dict, progress: ScanProgress
+        self, unique_files: list[str], platform_file_map: dict, progress: ScanProgress
     ) -> list[ROMEntry]:
         """Process files using multiple threads for improved performance.
 
@@ -196,42 +237,77 @@ class ROMScanner(QObject):
             List of all ROM entries found
         """
         all_entries: list[ROMEntry] = []
-        processed_files_lock = threading.Lock()
-        processed_files: set[Path] = set()
-
-        def process_single_file(file_path: Path) -> list[ROMEntry]:
+        last_progress_emit = 0.0
+        shard_count = self.PROCESSED_FILES_SHARDS
+        processed_shards: list[tuple[threading.Lock, set[Path]]] = [
+            (threading.Lock(), set()) for _ in range(shard_count)
+        ]
+
+        def claim_file(path: Path) -> bool:
+            """Mark a file processed; False if another worker already had."""
+            lock, processed = processed_shards[hash(path) % shard_count]
+            with lock:
+                if path in processed:
+                    return False
+                processed.add(path)
+                return True
+
+        def mark_processed(paths: set[Path]) -> None:
+            """Mark files processed, taking each shard's lock once."""
+            by_shard: dict[int, list[Path]] = {}
+            for path in paths:
+                by_shard.setdefault(hash(path) % shard_count, []).append(path)
+            for index, shard_paths in by_shard.items():
+                lock, processed = processed_shards[index]
+                with lock:
+                    processed.update(shard_paths)
+
+        def process_single_file(file_path: str) -> list[ROMEntry]:
             """Process a single file and return ROM entries."""
             if self._should_stop:
                 return []
 
             file_entries: list[ROMEntry] = []
 
-            # Thread-safe progress update with platform info
+            # Get relevant platform configs for this file
+            relevant_configs = platform_file_map.get(file_path, [])
+
+            # Thread-safe progress update, emitted at most once per interval
+            nonlocal last_progress_emit
             with self._progress_lock:
-                progress.current_file = str(file_path)
-                # Set platform name from the first config for this file
-                if file_path in platform_file_map and platform_file_map[file_path]:
-                    platform_config = platform_file_map[file_path][0]
-                    platform_id = platform_config.get("platform", "")
-                    # Try to get display name
-                    from ..platforms.core.platform_registry import platform_registry
-
-                    platform_obj = platform_registry.get_platform(platform_id)
-                    if platform_obj:
-                        progress.current_platform = platform_obj.name
-                    else:
-                        progress.current_platform = platform_id
                 progress.files_processed += 1
-                self.progress_updated.emit(progress)
+                now = time.monotonic()
+                if (
+                    now - last_progress_emit >= self.PROGRESS_EMIT_INTERVAL
+                    or progress.files_processed == progress.total_files
+                ):
+                    last_progress_emit = now
+                    progress.current_file = file_path
+                    # Set platform name from the first config for this file
+                    if relevant_configs:
+                        platform_config = relevant_configs[0]
+                        platform_id = platform_config.get("platform", "")
+                        # Try to get display name
+                        from ..platforms.core.platform_registry import platform_registry
+
+                        platform_obj = platform_registry.get_platform(platform_id)
+                        if platform_obj:
+                            progress.current_platform = platform_obj.name
+                        else:
+                            progress.current_platform = platform_id
+                    self.progress_updated.emit(progress)
+
+            # Resolve the handler from the string path once; unhandled files never need a Path
+            handler = extension_registry.get_handler_lower(os.path.splitext(file_path)[1].lower())
+            if handler is None:
+                return []
 
-            # Skip if already processed (thread-safe check)
-            with processed_files_lock:
-                if file_path in processed_files:
-                    return []
-                processed_files.add(file_path)
+            # Platforms and multi-file lookups work with Path objects from here on
+            path = Path(file_path)
 
-            # Get relevant platform configs for this file
-            relevant_configs = platform_file_map.get(file_path, [])
+            # Skip if already processed (thread-safe check)
+            if not claim_file(path):
+                return []
 
             for config in relevant_configs:
                 if self._should_stop:
@@ -246,14 +322,13 @@ class ROMScanner(QObject):
                 try:
                     # Process the file with this specific platform and its settings
                     entries = self._process_file(
-                        file_path, [platform], handle_archives, local_processed, config
+                        path, [platform], handle_archives, local_processed, config, handler
                     )
 
                     file_entries.extend(entries)
 
                     # Update global processed files with any related files found
-                    with processed_files_lock:
-                        processed_files.update(local_processed)
+                    mark_processed(local_processed)
 
                 except Exception as e:
                     self.logger.error(f"Error processing file {file_path}: {e}")
@@ -275,6 +350,7 @@ class ROMScanner(QObject):
                 }
 
                 # Collect results as they complete
+                found_batch: list[ROMEntry] = []
                 for future in concurrent.futures.as_completed(future_to_file):
                     if self._should_stop:
                         # Cancel remaining futures
@@ -284,16 +360,22 @@ class ROMScanner(QObject):
 
                     try:
                         entries = future.result()
-                        for entry in entries:
-                            all_entries.append(entry)
+                        if entries:
+                            all_entries.extend(entries)
                             with self._progress_lock:
-                                progress.rom_entries_found += 1
-                            self.rom_found.emit(entry)
+                                progress.rom_entries_found += len(entries)
+                            found_batch.extend(entries)
+                            if len(found_batch) >= self.ROM_FOUND_BATCH_SIZE:
+                                self.roms_found.emit(found_batch)
+                                found_batch = []
 
                     except Exception as e:
                         file_path = future_to_file[future]
                         self.logger.error(f"Error processing {file_path}: {e}")
 
+                if found_batch:
+                    self.roms_found.emit(found_batch)
+
             scan_time = time.time() - scan_start_time
             files_per_second = len(unique_files) / scan_time if scan_time > 0 else 0
             self.logger.info(
@@ -307,7 +389,12 @@ class ROMScanner(QObject):
         return all_entries
 
     def _check_or_create_fingerprint(
-        self, file_path: Path, platform_id: str, internal_path: str = None
+        self,
+        file_path: Path,
+        platform_id: str,
+        internal_path: str = None,
+        file_stat: os.stat_result | None = None,
+        content_path: Path | None = None,
     ) -> bool:
         """Check if ROM fingerprint exists and is valid, create if needed.
 
@@ -315,17 +402,25 @@ class ROMScanner(QObject):
             file_path: Path to ROM file or archive
             platform_id: Platform identifier
             internal_path: Internal path for archive files
+            file_stat: Stat of file_path the caller already took, saving another one
+            content_path: Extracted copy of the archive member, hashed instead of
+                decompressing it again
 
         Returns:
             True if ROM should be processed (new or changed), False if unchanged
         """
         try:
-            # Check if fingerprint exists
-            fingerprint = self._rom_database.get_fingerprint(file_path, internal_path)
+            # Build the key once; it is reused for the lookup and the store below
+            file_key = self._rom_database.get_file_key(file_path, internal_path)
+
+            # Check if fingerprint exists; archive members weren't part of the bulk lookup
+            fingerprint = self._known_fingerprints.get(file_key, _NOT_PREFETCHED)
+            if fingerprint is _NOT_PREFETCHED:
+                fingerprint = self._rom_database.get_fingerprint_by_key(file_key)
 
             if fingerprint:
                 # Verify fingerprint is still valid
-                status = self._rom_database.verify_fingerprint(fingerprint)
+                status = self._rom_database.verify_fingerprint(fingerprint, file_stat)
                 if status == FingerprintStatus.VALID:
                     # File unchanged, but check if we need to update RA data
                     if not fingerprint.ra_game_id and fingerprint.md5_hash:
@@ -344,7 +439,9 @@ class ROMScanner(QObject):
                                     fingerprint.ra_hash = fingerprint.md5_hash
                                     fingerprint.ra_last_check = time.time()
                                     # Save the updated fingerprint
-                                    self._rom_database.add_fingerprint(fingerprint)
+                                    self._rom_database.add_fingerprint_with_key(
+                                        file_key, fingerprint
+                                    )
                                     self.logger.info(
                                         f"Updated RA data for {file_path.name}: Game ID {fingerprint.ra_game_id}"
                                     )
@@ -359,14 +456,20 @@ class ROMScanner(QObject):
 
             # Create new fingerprint for new or changed files
             new_fingerprint = self._rom_database.create_rom_fingerprint(
-                file_path, internal_path=internal_path, platform=platform_id
+                file_path,
+                internal_path=internal_path,
+                platform=platform_id,
+                file_stat=file_stat,
+                content_path=content_path,
             )
 
             # Check RetroAchievements for new fingerprints
             self._check_retroachievements(new_fingerprint, file_path, platform_id)
 
-            # Store fingerprint in database
-            self._rom_database.add_fingerprint(new_fingerprint)
+            # Queue for the background writer so scan threads don't wait on commits
+            self._rom_database.add_fingerprint_deferred(file_key, new_fingerprint)
+            # Later platforms checking the same file see it before the queue is flushed
+            self._known_fingerprints[file_key] = new_fingerprint
             return True  # Process this file
 
         except Exception as e:
@@ -417,23 +520,107 @@ class ROMScanner(QObject):
             # Mark as checked to avoid repeated failures
             fingerprint.ra_last_check = time.time()
 
-    def _collect_files(self, directory: Path, scan_subdirectories: bool) -> list[Path]:
-        """Collect all files in directory."""
-        files = []
+    def _collect_files(self, directory: Path, scan_subdirectories: bool) -> list[str]:
+        """Collect all files in directory.
 
-        try:
-            if scan_subdirectories:
-                for root, _, filenames in os.walk(directory):
-                    root_path = Path(root)
-                    for filename in filenames:
-                        files.append(root_path / filename)
-            else:
-                files.extend([f for f in directory.iterdir() if f.is_file()])
-        except (OSError, PermissionError):
-            pass  # Skip inaccessible directories
+        Each subdirectory is listed as its own task, so on network shares the round trips
+        for sibling directories overlap instead of adding up level by level. Listings of
+        directories unchanged since the last scan come from the database. Paths stay
+        strings until a file is actually processed.
+        """
+        files: list[str] = []
+        listing_updates: list[tuple[str, int, list[str], list[str]]] = []
+        root = os.fspath(directory)
+        visited = {root}
+
+        def record(result: tuple[list[str], list[str], tuple | None]) -> list[str]:
+            dir_files, subdirectories, listing = result
+            files.extend(dir_files)
+            if listing is not None:
+                listing_updates.append(listing)
+            return subdirectories
+
+        if not scan_subdirectories:
+            record(self._scan_directory(root, False))
+        else:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+                pending = {executor.submit(self._scan_directory, root, True)}
+
+                while pending:
+                    done, pending = concurrent.futures.wait(
+                        pending, return_when=concurrent.futures.FIRST_COMPLETED
+                    )
+                    if self._should_stop:
+                        for future in pending:
+                            future.cancel()
+                        break
+
+                    for future in done:
+                        subdirectories = record(future.result())
+                        visited.update(subdirectories)
+                        pending.update(
+                            executor.submit(self._scan_directory, subdirectory, True)
+                            for subdirectory in subdirectories
+                        )
 
+        self._rom_database.put_directory_listings(listing_updates)
+        # Only a complete walk knows which cached directories no longer exist
+        if scan_subdirectories and not self._should_stop:
+            self._rom_database.prune_directory_listings(root, visited)
         return files
 
+    def _scan_directory(
+        self, directory: str, scan_subdirectories: bool
+    ) -> tuple[list[str], list[str], tuple[str, int, list[str], list[str]] | None]:
+        """List one directory level, from the directory cache when it is still valid.
+
+        Directory entries carry their file type, so files and subdirectories are told apart
+        without a stat per entry.
+
+        Args:
+            directory: Directory to list
+            scan_subdirectories: Whether to report subdirectories for further scanning
+
+        Returns:
+            Tuple of (file paths, subdirectory paths, listing to cache or None)
+        """
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except OSError:
+            self.logger.debug(f"Skipping unreadable directory: {directory}")
+            return [], [], None
+
+        listing = None
+        cached = self._rom_database.get_directory_listing(directory, mtime_ns)
+        if cached is not None:
+            file_names, subdirectory_names = cached
+        else:
+            file_names = []
+            subdirectory_names = []
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_file():
+                            file_names.append(entry.name)
+                        elif entry.is_dir(follow_symlinks=False):
+                            subdirectory_names.append(entry.name)
+            except OSError:
+                # Skip inaccessible directories without abandoning the rest of the tree
+                self.logger.debug(f"Skipping unreadable directory: {directory}")
+                return [], [], None
+
+            # A change within the filesystem's timestamp granularity could leave the mtime
+            # as it was, so only cache listings of directories that have settled
+            if time.time_ns() - mtime_ns > self.DIRECTORY_CACHE_SETTLE_NS:
+                listing = (directory, mtime_ns, file_names, subdirectory_names)
+
+        join = os.path.join
+        files = [join(directory, name) for name in file_names]
+        subdirectories = (
+            [join(directory, name) for name in subdirectory_names] if scan_subdirectories else []
+        )
+        return files, subdirectories, listing
+
     def _process_file(
         self,
         file_path: Path,
@@ -441,37 +628,47 @@ class ROMScanner(QObject):
         handle_archives: bool,
         processed_files: set[Path],
         config: dict = None,
+        handler: ExtensionHandler | None = None,
     ) -> list[ROMEntry]:
         """Process a single file and return ROM entries."""
         processed_files.add(file_path)
         entries: list[ROMEntry] = []
 
-        # Get extension handler
-        handler = extension_registry.get_handler_for_file(file_path)
-        if not handler:
-            return entries
+        # Get extension handler unless the caller already resolved it
+        if handler is None:
+            handler = extension_registry.get_handler_for_file(file_path)
+            if handler is None:
+                return entries
 
-        # Process based on handler type
-        if handler.handling_type == FileHandlingType.DIRECT:
+        # Process based on handler type (enum members are singletons)
+        handling_type = handler.handling_type
+        if handling_type is FileHandlingType.DIRECT:
             # Direct ROM file
-            entries.extend(self._process_direct_file(file_path, platforms, config))
+            entries.extend(
+                self._process_direct_file(file_path, platforms, config, handler.extension)
+            )
 
-        elif handler.handling_type == FileHandlingType.ARCHIVE and handle_archives:
+        elif handling_type is FileHandlingType.ARCHIVE and handle_archives:
             # Archive file
             entries.extend(self._process_archive_file(file_path, platforms, config))
 
-        elif handler.handling_type == FileHandlingType.MULTI_FILE:
+        elif handling_type is FileHandlingType.MULTI_FILE:
             # Multi-file ROM
             entries.extend(self._process_multi_file(file_path, platforms, processed_files, config))
 
         return entries
 
     def _process_direct_file(
-        self, file_path: Path, platforms: list[BasePlatform], config: dict = None
+        self,
+        file_path: Path,
+        platforms: list[BasePlatform],
+        config: dict = None,
+        extension: str | None = None,
     ) -> list[ROMEntry]:
         """Process a direct ROM file."""
         entries: list[ROMEntry] = []
-        extension = file_path.suffix.lower()
+        if extension is None:
+            extension = file_path.suffix.lower()
 
         # Find platforms that support this extension
         for platform in platforms:
@@ -483,11 +680,21 @@ class ROMScanner(QObject):
 
             if extension in supported_formats:
                 if platform.validate_rom(file_path):
+                    # One stat serves the fingerprint check and the entry's size
+                    try:
+                        file_stat = file_path.stat()
+                    except OSError:
+                        file_stat = None
+
                     # Check/create database fingerprint
                     # Always create ROM entry, even for unchanged files
-                    self._check_or_create_fingerprint(file_path, platform.platform_id)
+                    self._check_or_create_fingerprint(
+                        file_path, platform.platform_id, file_stat=file_stat
+                    )
 
-                    entry = platform.create_rom_entry(file_path)
+                    entry = platform.create_rom_entry(
+                        file_path, file_size=file_stat.st_size if file_stat else None
+                    )
                     entries.append(entry)
 
         return entries
@@ -507,7 +714,7 @@ class ROMScanner(QObject):
         # Find platforms that might have ROMs in this archive
         potential_platforms = set()
         for content_file in contents:
-            content_ext = Path(content_file).suffix.lower()
+            content_ext = os.path.splitext(content_file)[1].lower()
             for platform in platforms:
                 # Check user's format settings for archive contents
                 supported_formats = platform.archive_content_extensions
@@ -536,9 +743,9 @@ class ROMScanner(QObject):
 
         # Process extracted files
         for extracted_file in extracted_files:
+            content_ext = extracted_file.extracted_path.suffix.lower()
+            internal_extension = os.path.splitext(extracted_file.original_path)[1].lower()
             for platform in potential_platforms:
-                content_ext = extracted_file.extracted_path.suffix.lower()
-
                 # Check user's format settings for this extracted file
                 supported_formats = platform.archive_content_extensions
                 if config:
@@ -552,7 +759,10 @@ class ROMScanner(QObject):
                     # Check/create database fingerprint for archive content
                     # Always create ROM entry, even for unchanged files
                     self._check_or_create_fingerprint(
-                        file_path, platform.platform_id, extracted_file.original_path
+                        file_path,
+                        platform.platform_id,
+                        extracted_file.original_path,
+                        content_path=extracted_file.extracted_path,
                     )
 
                     entry = platform.create_rom_entry(
@@ -563,16 +773,10 @@ class ROMScanner(QObject):
                     # Update display name to use extracted filename
                     entry.display_name = extracted_file.extracted_path.stem
 
-                    # Update file type to use the internal ROM format instead of archive format
-                    internal_extension = Path(extracted_file.original_path).suffix.lower()
-                    if internal_extension == ".sfc":
-                        entry.metadata["file_type"] = "SFC"
-                    elif internal_extension == ".smc":
-                        entry.metadata["file_type"] = "SMC"
-                    elif internal_extension:
-                        entry.metadata["file_type"] = internal_extension.upper()[
-                            1:
-                        ]  # Remove the dot and uppercase
+                    # Update file type to use the internal ROM format instead of archive format;
+                    # interned since every ROM of a format repeats the same short string
+                    if internal_extension:
+                        entry.metadata["file_type"] = sys.intern(internal_extension[1:].upper())
                     entries.append(entry)
 
         return entries
@@ -5,6 +5,13 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 
 @dataclass
 class PlatformSettings:
@@ -93,8 +100,14 @@ class Settings:
     def save(self, file_path: Path) -> None:
         """Save settings to file."""
         file_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(self.to_dict(), f, indent=2)
+        # Serialize fully first so the file is written with one call, not one per token
+        if HAS_ORJSON:
+            payload = orjson.dumps(self.to_dict(), option=orjson.OPT_INDENT_2)
+        else:
+            payload = json.dumps(self.to_dict(), indent=2).encode("utf-8")
+
+        with open(file_path, "wb") as f:
+            f.write(payload)
 
     @classmethod
     def load(cls, file_path: Path) -> "Settings":
@@ -103,10 +116,12 @@ class Settings:
             return cls()  # Return default settings
 
         try:
-            with open(file_path, encoding="utf-8") as f:
-                data = json.load(f)
+            with open(file_path, "rb") as f:
+                raw = f.read()
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError
+            data = orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
             return cls.from_dict(data)
-        except (json.JSONDecodeError, OSError):
+        except (json.JSONDecodeError, UnicodeDecodeError, OSError):
             return cls()  # Return default settings on error
 
 
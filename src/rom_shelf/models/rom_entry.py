@@ -1,13 +1,17 @@
 """ROM entry data model."""
 
+import sys
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
 
-@dataclass
+@dataclass(slots=True)
 class ROMEntry:
-    """Represents a ROM file entry."""
+    """Represents a ROM file entry.
+
+    Slotted: one is kept per ROM in the library, and there is no per-instance __dict__.
+    """
 
     platform_id: str
     display_name: str
@@ -17,9 +21,13 @@ class ROMEntry:
     is_archive: bool = False
     related_files: list[Path] = field(default_factory=list)  # For multi-file ROMs
     metadata: dict[str, Any] = field(default_factory=dict)  # Platform-specific fields
+    is_new_to_database: bool = False  # Set by scanners when the ROM had no fingerprint yet
 
     def __post_init__(self) -> None:
         """Post-initialization processing."""
+        # Every ROM of a platform shares one id string instead of holding its own copy
+        self.platform_id = sys.intern(self.platform_id)
+
         if isinstance(self.file_path, str):
             self.file_path = Path(self.file_path)
 
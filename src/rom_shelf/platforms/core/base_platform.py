@@ -173,6 +173,7 @@ class BasePlatform(ABC):
         internal_path: str | None = None,
         is_archive: bool = False,
         related_files: list[Path] | None = None,
+        file_size: int | None = None,
     ) -> ROMEntry:
         """Create a ROM entry for this platform."""
         if related_files is None:
@@ -194,12 +195,13 @@ class BasePlatform(ABC):
         # Merge extracted metadata with platform-specific metadata
         metadata.update(extracted_metadata)
 
-        # Get file size
-        file_size = 0
-        try:
-            file_size = file_path.stat().st_size
-        except (OSError, FileNotFoundError):
-            pass
+        # Get file size unless the caller already stat'ed the file
+        if file_size is None:
+            file_size = 0
+            try:
+                file_size = file_path.stat().st_size
+            except (OSError, FileNotFoundError):
+                pass
 
         # Skip MD5 calculation during initial scan for performance
         # MD5 will be calculated in background after scan completes
@@ -1,5 +1,6 @@
 """Shared utilities for platform implementations."""
 
+import sys
 from pathlib import Path
 from typing import Any
 
@@ -167,6 +168,11 @@ class PlatformUtils:
     @staticmethod
     def create_base_metadata(file_path: Path, **extra_fields: Any) -> dict[str, Any]:
         """Create base metadata dictionary with common fields."""
+        # Share one string per format across all ROMs rather than one copy per ROM
+        file_type = extra_fields.get("file_type")
+        if isinstance(file_type, str):
+            extra_fields["file_type"] = sys.intern(file_type)
+
         metadata = {
             "name": file_path.stem,
             "region": PlatformUtils.parse_region_from_filename(file_path.stem),
@@ -1,15 +1,28 @@
 """Database service - abstraction layer for ROM database operations."""
 
 import logging
+import os
+from collections import Counter
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
-from ..core.rom_database import FingerprintStatus, ROMDatabase, get_rom_database
+from ..core.rom_database import (
+    DATABASE_VERSION,
+    FingerprintStatus,
+    ROMDatabase,
+    ROMFingerprint,
+    get_rom_database,
+)
 
 
 class DatabaseService:
     """Service for ROM database operations and integrity management."""
 
+    # Concurrent existence checks during cleanup; stat latency dominates on network shares
+    EXISTENCE_CHECK_WORKERS = 32
+
     def __init__(self, database: ROMDatabase | None = None) -> None:
         """Initialize the database service."""
         self.logger = logging.getLogger(__name__)
@@ -23,21 +36,25 @@ class DatabaseService:
     # Fingerprint Operations
     def get_fingerprint(
         self, file_path: str, internal_path: str | None = None
-    ) -> dict[str, Any] | None:
+    ) -> ROMFingerprint | None:
         """Get fingerprint data for a file."""
         try:
-            return self._database.get_fingerprint_data(file_path, internal_path)
+            return self._database.get_fingerprint(Path(file_path), internal_path)
         except Exception as e:
             self.logger.error(f"Error getting fingerprint for {file_path}: {e}")
             return None
 
-    def create_fingerprint(self, file_path: str, internal_path: str | None = None) -> str | None:
+    def create_fingerprint(
+        self, file_path: str, internal_path: str | None = None
+    ) -> ROMFingerprint | None:
         """Create a new fingerprint for a file."""
         try:
-            fingerprint_data = self._database.get_or_create_fingerprint(file_path, internal_path)
-            if fingerprint_data["status"] == FingerprintStatus.SUCCESS:
-                return fingerprint_data["fingerprint"]
-            return None
+            fingerprint = self._database.create_rom_fingerprint(Path(file_path), internal_path)
+            if not _has_hashes(fingerprint):
+                return None
+            if not self._database.add_fingerprint(fingerprint):
+                return None
+            return fingerprint
         except Exception as e:
             self.logger.error(f"Error creating fingerprint for {file_path}: {e}")
             return None
@@ -47,19 +64,26 @@ class DatabaseService:
     ) -> dict[str, Any]:
         """Get existing fingerprint or create new one."""
         try:
-            return self._database.get_or_create_fingerprint(file_path, internal_path)
+            fingerprint = self._database.get_fingerprint(Path(file_path), internal_path)
+            if (
+                fingerprint is not None
+                and self._database.verify_fingerprint(fingerprint) == FingerprintStatus.VALID
+            ):
+                return {"fingerprint": fingerprint, "status": FingerprintStatus.VALID}
+
+            fingerprint = self.create_fingerprint(file_path, internal_path)
+            if fingerprint is None:
+                return {"fingerprint": None, "status": FingerprintStatus.CORRUPTED}
+            return {"fingerprint": fingerprint, "status": FingerprintStatus.VALID}
         except Exception as e:
             self.logger.error(f"Error with fingerprint for {file_path}: {e}")
-            return {"fingerprint": None, "status": FingerprintStatus.ERROR, "error": str(e)}
+            return {"fingerprint": None, "status": FingerprintStatus.CORRUPTED, "error": str(e)}
 
     def remove_fingerprint(self, file_path: str, internal_path: str | None = None) -> bool:
         """Remove a fingerprint from the database."""
         try:
-            key = self._database._get_file_key(file_path, internal_path)
-            if key in self._database.fingerprints:
-                del self._database.fingerprints[key]
-                return True
-            return False
+            key = self._database.get_file_key(Path(file_path), internal_path)
+            return self._database.remove_fingerprints([key]) > 0
         except Exception as e:
             self.logger.error(f"Error removing fingerprint for {file_path}: {e}")
             return False
@@ -69,21 +93,17 @@ class DatabaseService:
         removed_count = 0
 
         try:
-            keys_to_remove = []
+            entries = [
+                (key, file_path)
+                for key, file_path in self._database.iter_fingerprint_fields("file_path")
+                if file_path
+            ]
+            exists = self._check_paths_exist(file_path for _, file_path in entries)
 
-            for key, fingerprint_data in self._database.fingerprints.items():
-                file_path = fingerprint_data.get("file_path")
-                if file_path:
-                    path = Path(file_path)
-                    if not path.exists():
-                        keys_to_remove.append(key)
-
-            for key in keys_to_remove:
-                del self._database.fingerprints[key]
-                removed_count += 1
+            keys_to_remove = [key for key, file_path in entries if not exists[file_path]]
 
+            removed_count = self._database.remove_fingerprints(keys_to_remove)
             if removed_count > 0:
-                self.save_database()
                 self.logger.info(f"Cleaned up {removed_count} missing file fingerprints")
 
         except Exception as e:
@@ -91,6 +111,13 @@ class DatabaseService:
 
         return removed_count
 
+    def _check_paths_exist(self, file_paths: Iterable[str]) -> dict[str, bool]:
+        """Check which files exist, stat'ing each distinct path once in parallel."""
+        # Archive members share their archive's path, so each file is checked once
+        unique_paths = list(set(file_paths))
+        with ThreadPoolExecutor(max_workers=self.EXISTENCE_CHECK_WORKERS) as executor:
+            return dict(zip(unique_paths, executor.map(os.path.exists, unique_paths), strict=True))
+
     def refresh_fingerprint(self, file_path: str, internal_path: str | None = None) -> bool:
         """Force refresh of a fingerprint."""
         try:
@@ -107,10 +134,12 @@ class DatabaseService:
 
     # Database Management
     def save_database(self) -> bool:
-        """Save the database to disk."""
+        """Flush pending database maintenance to disk.
+
+        Every write is committed as it happens, so this only refreshes planner statistics.
+        """
         try:
-            self._database.save()
-            return True
+            return self._database.optimize()
         except Exception as e:
             self.logger.error(f"Error saving database: {e}")
             return False
@@ -119,36 +148,34 @@ class DatabaseService:
         """Get information about the database."""
         try:
             stats = {
-                "total_fingerprints": len(self._database.fingerprints),
-                "database_version": getattr(self._database, "version", "unknown"),
-                "database_file": str(self._database.db_file),
-                "database_exists": self._database.db_file.exists(),
+                "total_fingerprints": self._database.get_statistics().get("total_roms", 0),
+                "database_version": DATABASE_VERSION,
+                "database_file": str(self._database.db_path),
+                "database_exists": self._database.db_path.exists(),
             }
 
             # File type statistics
-            file_types = {}
+            file_types: Counter[str] = Counter()
             missing_files = 0
             error_fingerprints = 0
 
-            for fingerprint_data in self._database.fingerprints.values():
-                file_path = fingerprint_data.get("file_path")
+            # Snapshot the rows so the read transaction isn't held open across file checks
+            rows = list(self._database.iter_fingerprint_fields("file_path", "md5_hash", "crc32"))
+            exists = self._check_paths_exist(file_path for _, file_path, _, _ in rows if file_path)
 
+            for _, file_path, md5_hash, crc32 in rows:
                 if file_path:
-                    path = Path(file_path)
-                    if path.exists():
-                        extension = path.suffix.lower()
-                        file_types[extension] = file_types.get(extension, 0) + 1
+                    if exists[file_path]:
+                        file_types[os.path.splitext(file_path)[1].lower()] += 1
                     else:
                         missing_files += 1
 
-                if fingerprint_data.get("status") == FingerprintStatus.ERROR:
+                if not md5_hash and crc32 is None:
                     error_fingerprints += 1
 
             stats.update(
                 {
-                    "file_types": dict(
-                        sorted(file_types.items(), key=lambda x: x[1], reverse=True)
-                    ),
+                    "file_types": dict(file_types.most_common()),
                     "missing_files": missing_files,
                     "error_fingerprints": error_fingerprints,
                 }
@@ -171,27 +198,21 @@ class DatabaseService:
         }
 
         try:
-            report["total_entries"] = len(self._database.fingerprints)
+            rows = list(self._database.iter_fingerprint_fields("file_path", "md5_hash", "crc32"))
+            exists = self._check_paths_exist(file_path for _, file_path, _, _ in rows if file_path)
 
-            for key, fingerprint_data in self._database.fingerprints.items():
-                file_path = fingerprint_data.get("file_path")
+            for _, file_path, md5_hash, crc32 in rows:
+                report["total_entries"] += 1
 
-                # Check for corrupted entries
-                if not isinstance(fingerprint_data, dict):
-                    report["corrupted_entries"] += 1
-                    report["issues"].append(f"Corrupted entry: {key}")
-                    continue
-
-                # Check for error status
-                if fingerprint_data.get("status") == FingerprintStatus.ERROR:
+                # Check for fingerprints whose hashing failed
+                if not md5_hash and crc32 is None:
                     report["error_entries"] += 1
                     report["issues"].append(f"Error entry: {file_path}")
                     continue
 
                 # Check if file exists
                 if file_path:
-                    path = Path(file_path)
-                    if not path.exists():
+                    if not exists[file_path]:
                         report["missing_files"] += 1
                         report["issues"].append(f"Missing file: {file_path}")
                         continue
@@ -206,7 +227,7 @@ class DatabaseService:
     def compact_database(self) -> dict[str, Any]:
         """Compact the database by removing invalid entries."""
         result = {
-            "entries_before": len(self._database.fingerprints),
+            "entries_before": 0,
             "entries_removed": 0,
             "entries_after": 0,
             "success": False,
@@ -214,34 +235,25 @@ class DatabaseService:
 
         try:
             keys_to_remove = []
+            rows = list(self._database.iter_fingerprint_fields("file_path", "md5_hash", "crc32"))
+            exists = self._check_paths_exist(file_path for _, file_path, _, _ in rows if file_path)
+
+            for key, file_path, md5_hash, crc32 in rows:
+                result["entries_before"] += 1
 
-            for key, fingerprint_data in self._database.fingerprints.items():
-                should_remove = False
-
-                # Remove entries with missing files
-                file_path = fingerprint_data.get("file_path")
-                if (
-                    file_path
-                    and not Path(file_path).exists()
-                    or fingerprint_data.get("status") == FingerprintStatus.ERROR
-                    or not isinstance(fingerprint_data, dict)
-                    or "fingerprint" not in fingerprint_data
-                ):
-                    should_remove = True
-
-                if should_remove:
+                # Remove entries with missing files or failed hashing
+                if (file_path and not exists[file_path]) or (not md5_hash and crc32 is None):
                     keys_to_remove.append(key)
 
-            # Remove identified entries
-            for key in keys_to_remove:
-                del self._database.fingerprints[key]
+            result["entries_removed"] = self._database.remove_fingerprints(keys_to_remove)
+            result["entries_after"] = result["entries_before"] - result["entries_removed"]
 
-            result["entries_removed"] = len(keys_to_remove)
-            result["entries_after"] = len(self._database.fingerprints)
+            # Cached listings of directories no longer scanned are never pruned by a walk
+            self._database.clear_directory_listings()
 
-            # Save compacted database
+            # Reclaim the space left by deleted rows
             if keys_to_remove:
-                self.save_database()
+                self._database.vacuum()
 
             result["success"] = True
 
@@ -253,11 +265,8 @@ class DatabaseService:
     def export_database(self, export_path: Path) -> bool:
         """Export database to a different location."""
         try:
-            # Create a copy of the database at the export location
-            export_db = ROMDatabase(export_path)
-            export_db.fingerprints = self._database.fingerprints.copy()
-            export_db.save()
-            return True
+            # SQLite copies the pages itself; no fingerprints are loaded into Python
+            return self._database.export_to(export_path)
 
         except Exception as e:
             self.logger.error(f"Error exporting database to {export_path}: {e}")
@@ -269,18 +278,9 @@ class DatabaseService:
             if not import_path.exists():
                 return False
 
-            import_db = ROMDatabase(import_path)
-
-            if merge:
-                # Merge with existing database
-                for key, fingerprint_data in import_db.fingerprints.items():
-                    if key not in self._database.fingerprints:
-                        self._database.fingerprints[key] = fingerprint_data
-            else:
-                # Replace existing database
-                self._database.fingerprints = import_db.fingerprints.copy()
-
-            self.save_database()
+            # The source is read as-is; importing never migrates or rewrites it
+            # Merging keeps existing entries; otherwise they are replaced wholesale
+            self._database.import_from(import_path, replace=not merge)
             return True
 
         except Exception as e:
@@ -288,57 +288,46 @@ class DatabaseService:
             return False
 
     # Query Operations
-    def find_fingerprints_by_pattern(self, pattern: str) -> list[dict[str, Any]]:
+    def find_fingerprints_by_pattern(self, pattern: str) -> list[ROMFingerprint]:
         """Find fingerprints matching a file path pattern."""
         results = []
 
         try:
             pattern = pattern.lower()
 
-            for key, fingerprint_data in self._database.fingerprints.items():
-                file_path = fingerprint_data.get("file_path", "")
-                if pattern in file_path.lower():
-                    result = fingerprint_data.copy()
-                    result["key"] = key
-                    results.append(result)
+            for _, fingerprint in self._database.iter_fingerprints():
+                if pattern in fingerprint.file_path.lower():
+                    results.append(fingerprint)
 
         except Exception as e:
             self.logger.error(f"Error searching fingerprints: {e}")
 
         return results
 
-    def get_fingerprints_by_extension(self, extension: str) -> list[dict[str, Any]]:
+    def get_fingerprints_by_extension(self, extension: str) -> list[ROMFingerprint]:
         """Get all fingerprints for files with a specific extension."""
         results = []
         extension = extension.lower()
 
         try:
-            for key, fingerprint_data in self._database.fingerprints.items():
-                file_path = fingerprint_data.get("file_path", "")
-                if file_path.lower().endswith(extension):
-                    result = fingerprint_data.copy()
-                    result["key"] = key
-                    results.append(result)
+            for _, fingerprint in self._database.iter_fingerprints():
+                if fingerprint.file_path.lower().endswith(extension):
+                    results.append(fingerprint)
 
         except Exception as e:
             self.logger.error(f"Error getting fingerprints by extension: {e}")
 
         return results
 
-    def get_duplicate_fingerprints(self) -> dict[str, list[dict[str, Any]]]:
+    def get_duplicate_fingerprints(self) -> dict[str, list[ROMFingerprint]]:
         """Find fingerprints that have the same hash (potential duplicates)."""
         fingerprint_groups = {}
 
         try:
-            for key, fingerprint_data in self._database.fingerprints.items():
-                fingerprint = fingerprint_data.get("fingerprint")
-                if fingerprint:
-                    if fingerprint not in fingerprint_groups:
-                        fingerprint_groups[fingerprint] = []
-
-                    result = fingerprint_data.copy()
-                    result["key"] = key
-                    fingerprint_groups[fingerprint].append(result)
+            for _, fingerprint in self._database.iter_fingerprints():
+                md5_hash = fingerprint.md5_hash
+                if md5_hash:
+                    fingerprint_groups.setdefault(md5_hash, []).append(fingerprint)
 
             # Only return groups with multiple entries
             duplicates = {
@@ -350,3 +339,8 @@ class DatabaseService:
             duplicates = {}
 
         return duplicates
+
+
+def _has_hashes(fingerprint: ROMFingerprint) -> bool:
+    """Check whether hashing succeeded when the fingerprint was created."""
+    return bool(fingerprint.md5_hash) or fingerprint.crc32 is not None
@@ -215,9 +215,7 @@ class PlatformService:
                                     best_match_length = len(pattern)
 
                     if best_match:
-                        if best_match not in matches:
-                            matches[best_match] = []
-                        matches[best_match].append(item)
+                        matches.setdefault(best_match, []).append(item)
 
         except (OSError, PermissionError) as e:
             self.logger.error(f"Error scanning directory {parent_dir}: {e}")
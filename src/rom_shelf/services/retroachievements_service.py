@@ -752,11 +752,10 @@ class RetroAchievementsService:
                 if progress_callback:
                     progress_callback(i + 1, len(game_ids), f"Processing game {game_id}...")
 
-                if game_id in game_progress_map:
+                progress = game_progress_map.get(game_id)
+                if progress is not None:
                     # Update database with progress data
-                    self._db.update_user_game_progress(
-                        username, game_id, game_progress_map[game_id]
-                    )
+                    self._db.update_user_game_progress(username, game_id, progress)
                     results["synced"] += 1
                 else:
                     # Game not in recent games, might have 0 progress
@@ -383,9 +383,7 @@ class SearchService:
         # Group ROMs by clean name
         for rom in roms:
             clean_key = rom.clean_name.lower().strip()
-            if clean_key not in name_groups:
-                name_groups[clean_key] = []
-            name_groups[clean_key].append(rom)
+            name_groups.setdefault(clean_key, []).append(rom)
 
         # Find groups with multiple entries
         for clean_name, rom_list in name_groups.items():
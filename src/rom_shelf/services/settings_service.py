@@ -137,9 +137,7 @@ class SettingsService:
 
     def set_platform_setting(self, platform_id: str, key: str, value: Any) -> None:
         """Set a specific platform setting."""
-        if platform_id not in self.settings.platform_settings:
-            self.settings.platform_settings[platform_id] = {}
-        self.settings.platform_settings[platform_id][key] = value
+        self.settings.platform_settings.setdefault(platform_id, {})[key] = value
 
     def get_platform_directories(self, platform_id: str) -> list[str]:
         """Get ROM directories for a specific platform."""
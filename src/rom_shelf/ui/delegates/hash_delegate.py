@@ -105,7 +105,7 @@ class HashDelegate(QStyledItemDelegate):
             x += indicator_width
 
         # Check and draw CRC32 indicator
-        if fingerprint.crc32:
+        if fingerprint.crc32 is not None:
             rect = QRect(x, y, indicator_width, height)
             self._hash_rects[index_key]["crc32"] = rect
             painter.setPen(hash_colors["crc32"])
@@ -173,8 +173,8 @@ class HashDelegate(QStyledItemDelegate):
                         if hash_type == "md5" and fingerprint.md5_hash:
                             copied_text = fingerprint.md5_hash
                             tooltip_text = "MD5 hash copied!"
-                        elif hash_type == "crc32" and fingerprint.crc32:
-                            copied_text = f"{fingerprint.crc32:08X}"
+                        elif hash_type == "crc32" and fingerprint.crc32 is not None:
+                            copied_text = fingerprint.crc32_hex
                             tooltip_text = "CRC32 hash copied!"
                         elif hash_type == "header" and fingerprint.header_hash:
                             copied_text = fingerprint.header_hash
@@ -222,9 +222,9 @@ class HashDelegate(QStyledItemDelegate):
                                 f"<b>MD5:</b><br>{fingerprint.md5_hash}<br><i>Click to copy</i>"
                             )
                             cursor_set = True
-                        elif hash_type == "crc32" and fingerprint.crc32:
+                        elif hash_type == "crc32" and fingerprint.crc32 is not None:
                             tooltip = (
-                                f"<b>CRC32:</b><br>{fingerprint.crc32:08X}<br><i>Click to copy</i>"
+                                f"<b>CRC32:</b><br>{fingerprint.crc32_hex}<br><i>Click to copy</i>"
                             )
                             cursor_set = True
                         elif hash_type == "header" and fingerprint.header_hash:
@@ -279,9 +279,9 @@ class HashDelegate(QStyledItemDelegate):
                             tooltip = (
                                 f"<b>MD5:</b><br>{fingerprint.md5_hash}<br><i>Click to copy</i>"
                             )
-                        elif hash_type == "crc32" and fingerprint.crc32:
+                        elif hash_type == "crc32" and fingerprint.crc32 is not None:
                             tooltip = (
-                                f"<b>CRC32:</b><br>{fingerprint.crc32:08X}<br><i>Click to copy</i>"
+                                f"<b>CRC32:</b><br>{fingerprint.crc32_hex}<br><i>Click to copy</i>"
                             )
                         elif hash_type == "header" and fingerprint.header_hash:
                             header_display = fingerprint.header_hash[:32]
@@ -1,5 +1,6 @@
 """ROM table view component with configurable columns."""
 
+import logging
 import os
 import platform
 import subprocess
@@ -17,6 +18,8 @@ from ..delegates.hash_delegate import HashDelegate
 from ..delegates.language_delegate import LanguageDelegate
 from ..delegates.region_delegate import RegionDelegate
 
+logger = logging.getLogger(__name__)
+
 
 class ROMTableView(QTableView):
     """Enhanced table view for displaying ROM entries."""
@@ -168,16 +171,16 @@ class ROMTableView(QTableView):
         for i, column in enumerate(columns):
             # Apply custom delegates where needed
             if column.key == "hash":
-                print(f"[DEBUG] Setting hash delegate for column {i}")
+                logger.debug("Setting hash delegate for column %d", i)
                 self.setItemDelegateForColumn(i, self._hash_delegate)
             elif column.key == "region":
-                print(f"[DEBUG] Setting region delegate for column {i}")
+                logger.debug("Setting region delegate for column %d", i)
                 self.setItemDelegateForColumn(i, self._region_delegate)
             elif column.key == "language":
-                print(f"[DEBUG] Setting language delegate for column {i}")
+                logger.debug("Setting language delegate for column %d", i)
                 self.setItemDelegateForColumn(i, self._language_delegate)
             elif column.key == "achievements":
-                print(f"[DEBUG] Setting achievement delegate for column {i}")
+                logger.debug("Setting achievement delegate for column %d", i)
                 self.setItemDelegateForColumn(i, self._achievement_delegate)
 
             # Configure column sizing
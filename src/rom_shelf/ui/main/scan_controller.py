@@ -206,13 +206,18 @@ class ROMScanController(QObject):
         return platform_configs, summaries, total_directories
 
     def _connect_thread_signals(self, thread: ROMScannerThread) -> None:
-        thread.scanner.rom_found.connect(self._handle_rom_found)
+        thread.scanner.roms_found.connect(self._handle_roms_found)
         thread.scanner.scan_completed.connect(self._handle_scan_completed)
         thread.scanner.scan_error.connect(self._handle_scan_error)
         thread.scanner.progress_updated.connect(self._handle_scan_progress)
 
     # Thread callbacks -----------------------------------------------------------------
 
+    def _handle_roms_found(self, rom_entries: list[Any]) -> None:
+        # The scanner batches entries to cut cross-thread signal traffic
+        for rom_entry in rom_entries:
+            self._handle_rom_found(rom_entry)
+
     def _handle_rom_found(self, rom_entry) -> None:
         is_new = bool(getattr(rom_entry, "is_new_to_database", False))
         if is_new:
@@ -1166,8 +1166,9 @@ QStatusBar::item {{
     def _spin_arrow_data(self, direction: str, color: str) -> str:
         """Generate a base64 SVG data URL for spinbox arrows."""
         key = (direction, color)
-        if key in _SPIN_ARROW_CACHE:
-            return _SPIN_ARROW_CACHE[key]
+        cached = _SPIN_ARROW_CACHE.get(key)
+        if cached is not None:
+            return cached
 
         _SPIN_ICON_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -58,10 +58,11 @@ class ThemeManager:
     def set_theme(self, theme_name: str) -> bool:
         """Set the current theme by name."""
         theme_key = theme_name.lower()
-        if theme_key in self._themes:
-            self._current_theme = self._themes[theme_key]
-            return True
-        return False
+        theme = self._themes.get(theme_key)
+        if theme is None:
+            return False
+        self._current_theme = theme
+        return True
 
     def get_current_theme(self) -> BaseTheme:
         """Expose the active theme (guaranteed to be available)."""